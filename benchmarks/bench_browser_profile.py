@@ -0,0 +1,76 @@
+"""Compare page-load time, bytes and memory per browser with and without the lean profile.
+
+Loads the local replica page (with course-page weight: image, font, video
+and analytics script) repeatedly in one browser per profile, waiting the
+way the automation does: document ready, then the email input. Pass --url
+to measure a real page instead; bytes are only counted for the local page.
+
+Usage:
+    python benchmarks/bench_browser_profile.py --loads 10
+    python benchmarks/bench_browser_profile.py --url https://maven.com/p/... --loads 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('MAVEN_CACHE_DIR', tempfile.mkdtemp(prefix="bench-cache-"))
+os.environ.setdefault('MAVEN_DATA_DIR', tempfile.mkdtemp(prefix="bench-data-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By  # noqa: E402
+
+from local_form import start_server  # noqa: E402
+import main  # noqa: E402
+
+
+def measure(url, lean, loads, server=None):
+    """Load url `loads` times in a fresh browser; return (load seconds, KB per load, browser MB)"""
+    manager = main.BrowserSessionManager(max_idle=0)
+    session = manager.acquire(lean=lean)
+    driver = session.driver
+    input_locator = (By.CSS_SELECTOR, ", ".join(main.EMAIL_INPUT_SELECTORS))
+    durations = []
+    bytes_before = server.bytes_sent if server else 0
+
+    try:
+        for _ in range(loads):
+            started = time.perf_counter()
+            driver.get(url)
+            waiter = main.ReadinessWaiter(driver)
+            waiter.document_ready()
+            waiter.form_rendered(input_locator)
+            durations.append(time.perf_counter() - started)
+        memory = session.memory_mb()
+    finally:
+        manager.release(session)  # max_idle=0, so this closes it
+
+    kb_per_load = (server.bytes_sent - bytes_before) / loads / 1024 if server else float('nan')
+    return sorted(durations), kb_per_load, memory if memory is not None else float('nan')
+
+
+def run(url, loads):
+    server = None
+    if url is None:
+        server = start_server(assets=True)
+        url = server.url
+
+    print(f"Page: {url}")
+    print(f"{'profile':>8} {'p50 s':>8} {'p95 s':>8} {'KB/load':>10} {'MB':>8}")
+    try:
+        for lean in (False, True):
+            durations, kb_per_load, memory = measure(url, lean, loads, server)
+            print(f"{'lean' if lean else 'full':>8} {main._percentile(durations, 50):>8.2f} "
+                  f"{main._percentile(durations, 95):>8.2f} {kb_per_load:>10.0f} {memory:>8.0f}")
+    finally:
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None, help="Page to load instead of the local replica")
+    parser.add_argument("--loads", type=int, default=10, help="Page loads per profile")
+    args = parser.parse_args()
+    run(args.url, args.loads)
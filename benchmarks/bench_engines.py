@@ -0,0 +1,94 @@
+"""Compare processes-per-worker (Selenium) with contexts-per-process (CDP) against the local form.
+
+For each concurrency level, runs the same emails through both engines and
+reports emails/minute accepted by the server, peak resident memory of all
+browser processes together (sampled with psutil) and how many concurrent
+sessions that is per GB of RAM.
+
+Usage:
+    python benchmarks/bench_engines.py --emails 40 --concurrency 1 4 8 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('MAVEN_CACHE_DIR', tempfile.mkdtemp(prefix="bench-cache-"))
+os.environ.setdefault('MAVEN_DATA_DIR', tempfile.mkdtemp(prefix="bench-data-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil  # noqa: E402
+
+from local_form import start_server  # noqa: E402
+import main  # noqa: E402
+
+
+class MemorySampler:
+    """Samples the summed RSS of every child process of this one until stopped"""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        me = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for child in me.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_mb = max(self.peak_mb, total / (1024 * 1024))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_engine(engine, emails, url, concurrency, delay, lean):
+    manager = main.get_session_manager()
+    with MemorySampler() as sampler:
+        started = time.perf_counter()
+        if engine == 'cdp':
+            results = main.run_cdp_pool(emails, url, delay, num_contexts=concurrency, lean_browser=lean)
+        else:
+            results = main.run_signup_pool(emails, url, delay, num_workers=concurrency, lean_browser=lean)
+        elapsed = time.perf_counter() - started
+    manager.shutdown()  # Don't let warm Selenium browsers count against the next run
+    return results, elapsed, sampler.peak_mb
+
+
+def run(num_emails, levels, delay, lean):
+    print(f"{'engine':>9} {'sessions':>8} {'seconds':>8} {'emails/min':>10} {'success':>7} {'peak MB':>8} {'sessions/GB':>11}")
+    for concurrency in levels:
+        for engine in ('selenium', 'cdp'):
+            server = start_server()
+            emails = [f"{engine}{concurrency}-{i}@example.com" for i in range(num_emails)]
+            try:
+                results, elapsed, peak_mb = run_engine(engine, emails, server.url, concurrency, delay, lean)
+            finally:
+                server.shutdown()
+            success = len([r for r in results if r['status'] == 'success'])
+            per_gb = concurrency / (peak_mb / 1024) if peak_mb else float('nan')
+            print(f"{engine:>9} {concurrency:>8} {elapsed:>8.1f} {len(server.signups) / elapsed * 60:>10.1f} "
+                  f"{success:>7} {peak_mb:>8.0f} {per_gb:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=40, help="Emails per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Workers / contexts to compare")
+    parser.add_argument("--delay", type=float, default=0, help="Delay between emails in seconds")
+    parser.add_argument("--lean", action="store_true", help="Use the lean resource-blocking profile for both engines")
+    args = parser.parse_args()
+    run(args.emails, args.concurrency, args.delay, args.lean)
@@ -0,0 +1,67 @@
+"""Compare email extraction paths on synthetic CSV data.
+
+Times the column-aware fast path against the legacy regex over
+``df.to_string()``, and optionally the chunked OpenAI path (needs
+OPENAI_API_KEY and costs real tokens).
+
+Usage:
+    python benchmarks/bench_extraction.py --rows 10000 100000 1000000
+    OPENAI_API_KEY=... python benchmarks/bench_extraction.py --rows 10000 --llm
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def make_frame(rows):
+    """Synthetic CRM export: name, email, company and notes columns"""
+    index = pd.RangeIndex(rows).astype(str)
+    return pd.DataFrame({
+        'Name': 'Person ' + index,
+        'Email': 'person' + index + '@example' + (pd.RangeIndex(rows) % 50).astype(str) + '.com',
+        'Company': 'Company ' + (pd.RangeIndex(rows) % 1000).astype(str),
+        'Notes': 'Met at conference, follow up in Q' + (pd.RangeIndex(rows) % 4 + 1).astype(str),
+    })
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(row_counts, use_llm):
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if use_llm and not api_key:
+        print("--llm needs OPENAI_API_KEY; skipping the OpenAI path")
+        use_llm = False
+
+    print(f"{'rows':>10} {'path':>14} {'seconds':>10} {'rows/s':>12} {'emails':>10}")
+    for rows in row_counts:
+        df = make_frame(rows)
+
+        paths = [
+            ('fast path', lambda: main.extract_emails_from_dataframe(df)[0]),
+            ('legacy regex', lambda: main.extract_emails_from_text(df.to_string(index=False))),
+        ]
+        if use_llm:
+            paths.append(('openai chunks', lambda: main.extract_emails_chunked(df, api_key)[0]))
+
+        for name, fn in paths:
+            emails, elapsed = timed(fn)
+            print(f"{rows:>10} {name:>14} {elapsed:>10.3f} {rows / elapsed:>12.0f} {len(emails):>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Row counts to generate")
+    parser.add_argument("--llm", action="store_true", help="Also time the chunked OpenAI path")
+    args = parser.parse_args()
+    run(args.rows, args.llm)
@@ -0,0 +1,118 @@
+"""Compare upload parsing before and after the Arrow-backed ingestion layer.
+
+Writes a synthetic CRM export (see bench_extraction.make_frame) in each
+supported format, then parses it the old way (pd.read_csv with the default
+engine, inferred dtypes, every column) and the new way (sniffed format,
+email columns only, dtype=str, pyarrow engine). Every parse runs in a fresh
+process, and peak memory is the high-water mark of its RSS during the parse
+minus the RSS before it (Linux only: it resets /proc/self/clear_refs). The
+old path only understands plain CSV; the other formats show the new path
+alone.
+
+Usage:
+    python benchmarks/bench_ingestion.py --rows 1000000
+    python benchmarks/bench_ingestion.py --rows 100000 --xlsx
+"""
+import argparse
+import gzip
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+os.environ.setdefault('MAVEN_CACHE_DIR', tempfile.mkdtemp(prefix="bench-cache-"))
+os.environ.setdefault('MAVEN_DATA_DIR', tempfile.mkdtemp(prefix="bench-data-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_extraction import make_frame  # noqa: E402
+
+
+def write_files(rows, directory, xlsx):
+    """Write the synthetic export in every format; returns {format label: path}"""
+    df = make_frame(rows)
+    paths = {
+        'csv': os.path.join(directory, "export.csv"),
+        'csv.gz': os.path.join(directory, "export.csv.gz"),
+        'tsv': os.path.join(directory, "export.tsv"),
+        'jsonl': os.path.join(directory, "export.jsonl"),
+        'jsonl.gz': os.path.join(directory, "export.jsonl.gz"),
+    }
+    df.to_csv(paths['csv'], index=False)
+    with open(paths['csv'], 'rb') as src, gzip.open(paths['csv.gz'], 'wb') as dst:
+        dst.write(src.read())
+    df.to_csv(paths['tsv'], index=False, sep='\t')
+    df.to_json(paths['jsonl'], orient='records', lines=True)
+    with open(paths['jsonl'], 'rb') as src, gzip.open(paths['jsonl.gz'], 'wb') as dst:
+        dst.write(src.read())
+    if xlsx:
+        paths['xlsx'] = os.path.join(directory, "export.xlsx")
+        df.to_excel(paths['xlsx'], index=False)
+    return paths
+
+
+def _proc_status_mb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024  # Reported in kB
+    return float('nan')
+
+
+def _reset_peak_rss():
+    """Start a new RSS high-water mark (VmHWM) from the current RSS"""
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+def parse_once(path, method, results):
+    """Child process: parse path with method, report seconds, rows, columns, frame MB and peak RSS growth"""
+    import main
+
+    upload = main.LocalUpload(path)
+    _reset_peak_rss()
+    baseline = _proc_status_mb('VmRSS')
+    started = time.perf_counter()
+    if method == 'legacy':
+        df = pd.read_csv(upload)
+    else:
+        spec = main.sniff_upload(upload)
+        columns = main.detect_email_columns(main.read_upload(upload, spec, nrows=main.EMAIL_COLUMN_SAMPLE_SIZE)) or None
+        df = main.read_upload(upload, spec, usecols=columns)
+    elapsed = time.perf_counter() - started
+    results.put((elapsed, len(df), len(df.columns), df.memory_usage(deep=True).sum() / (1024 * 1024),
+                 _proc_status_mb('VmHWM') - baseline))
+
+
+def measure(path, method):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=parse_once, args=(path, method, results))
+    process.start()
+    outcome = results.get()
+    process.join()
+    return outcome
+
+
+def run(rows, xlsx):
+    with tempfile.TemporaryDirectory(prefix="bench-ingestion-") as directory:
+        paths = write_files(rows, directory, xlsx)
+        print(f"{rows:,} rows")
+        print(f"{'format':>9} {'path':>7} {'file MB':>8} {'seconds':>8} {'rows/s':>11} {'columns':>7} "
+              f"{'frame MB':>9} {'peak MB':>8}")
+        for label, path in paths.items():
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+            for method in (('legacy', 'arrow') if label == 'csv' else ('arrow',)):
+                elapsed, parsed_rows, columns, frame_mb, peak_mb = measure(path, method)
+                print(f"{label:>9} {method:>7} {file_mb:>8.1f} {elapsed:>8.2f} {parsed_rows / elapsed:>11,.0f} "
+                      f"{columns:>7} {frame_mb:>9.1f} {peak_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the synthetic export")
+    parser.add_argument("--xlsx", action="store_true", help="Also write and parse an xlsx workbook (slow, needs openpyxl)")
+    args = parser.parse_args()
+    run(args.rows, args.xlsx)
@@ -0,0 +1,119 @@
+"""Offline benchmark of the signup automation against the local replica form.
+
+Runs headless Chrome through the real automation loop for every scenario
+(page variant x render delay x worker count) and reports emails/minute
+accepted by the server, how many submissions the page visibly confirmed,
+per-email latency percentiles and the peak memory of a single browser. No
+network access is needed; caches and job data go to a temporary directory
+so the app's own state is left alone.
+
+Usage:
+    python benchmarks/bench_signup.py --emails 20 --workers 1 2 4
+    python benchmarks/bench_signup.py --buttons sign-up-for-free link --render-delays 0 1.5 --failure-rate 0.1
+    python benchmarks/bench_signup.py --failure-rate 0.2 --rate-limit 60
+    python benchmarks/bench_signup.py --emails 200 --http-mode
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+os.environ.setdefault('MAVEN_CACHE_DIR', tempfile.mkdtemp(prefix="bench-cache-"))
+os.environ.setdefault('MAVEN_DATA_DIR', tempfile.mkdtemp(prefix="bench-data-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_form import BUTTON_VARIANTS, EMAIL_INPUT_VARIANTS, start_server  # noqa: E402
+import main  # noqa: E402
+
+
+def email_latencies(timeline):
+    """Seconds spent on each email, excluding the pacing delay after it (sub-phases are already in their parent)"""
+    per_email = {}
+    for event in timeline:
+        if event['email'] is not None and event['phase'] != 'pacing' and event.get('parent') is None:
+            per_email[event['email']] = per_email.get(event['email'], 0) + event['duration']
+    return sorted(per_email.values())
+
+
+def bench_chrome_setup():
+    """Time test_chrome_setup cold (browser launch) and warm (reused browser)"""
+    for label in ("cold", "warm"):
+        started = time.perf_counter()
+        ok, _ = main.test_chrome_setup()
+        print(f"test_chrome_setup ({label}): {time.perf_counter() - started:.2f}s {'ok' if ok else 'FAILED'}")
+
+
+def bench_scenario(emails, email_input, button, render_delay, failure_rate, num_workers, delay, rate_limit=None,
+                   http_mode=False, lean_browser=False):
+    server = start_server(render_delay=render_delay, failure_rate=failure_rate, email_input=email_input, button=button,
+                          newsletter=email_input == 'placeholder')
+    manager = main.get_session_manager()
+    manager.peak_memory_mb = None
+    timeline = []
+
+    try:
+        started = time.perf_counter()
+        results = main.automate_maven_signup(emails, server.url, delay, num_workers=num_workers, resume=False,
+                                             timeline=timeline, rate_limit=rate_limit, http_mode=http_mode,
+                                             lean_browser=lean_browser)
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    latencies = email_latencies(timeline)
+    success = len([r for r in results if r['status'] == 'success'])
+    row = {
+        'scenario': f"{email_input}/{button}/{render_delay:g}s",
+        'workers': num_workers,
+        'seconds': elapsed,
+        'emails/min': len(server.signups) / elapsed * 60,
+        'success': success,
+        'confirmed': len([r for r in results if r.get('confirmed')]),
+        'accepted': len(server.signups),
+        'rejected': len(server.rejected),
+        'p50': main._percentile(latencies, 50) if latencies else float('nan'),
+        'p95': main._percentile(latencies, 95) if latencies else float('nan'),
+        'p99': main._percentile(latencies, 99) if latencies else float('nan'),
+        'peak MB': manager.peak_memory_mb or float('nan'),
+        'resets': dict(Counter(r['reset_strategy'] for r in results if r.get('reset_strategy'))),
+    }
+    print(f"{row['scenario']:>36} {row['workers']:>7} {row['seconds']:>8.1f} {row['emails/min']:>10.1f} "
+          f"{row['success']:>7} {row['confirmed']:>9} {row['accepted']:>8} {row['rejected']:>8} "
+          f"{row['p50']:>6.2f} {row['p95']:>6.2f} {row['p99']:>6.2f} {row['peak MB']:>8.0f}  {row['resets']}")
+    return row
+
+
+def run(args):
+    emails = [f"bench{i}@example.com" for i in range(args.emails)]
+    bench_chrome_setup()
+
+    print(f"{'scenario':>36} {'workers':>7} {'seconds':>8} {'emails/min':>10} {'success':>7} {'confirmed':>9} {'accepted':>8} "
+          f"{'rejected':>8} {'p50':>6} {'p95':>6} {'p99':>6} {'peak MB':>8}  resets")
+    rows = []
+    for email_input in args.inputs:
+        for button in args.buttons:
+            for render_delay in args.render_delays:
+                for num_workers in args.workers:
+                    rows.append(bench_scenario(emails, email_input, button, render_delay, args.failure_rate,
+                                               num_workers, args.delay, args.rate_limit, args.http_mode, args.lean))
+    main.get_session_manager().shutdown()
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=20, help="Number of emails to submit per scenario")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="Worker counts to compare")
+    parser.add_argument("--delay", type=float, default=0, help="Delay between emails in seconds")
+    parser.add_argument("--inputs", nargs="+", default=['placeholder'], choices=list(EMAIL_INPUT_VARIANTS),
+                        help="Email input variants to serve")
+    parser.add_argument("--buttons", nargs="+", default=['sign-up-for-free'], choices=list(BUTTON_VARIANTS),
+                        help="Submit button variants to serve")
+    parser.add_argument("--render-delays", type=float, nargs="+", default=[0], help="Seconds before the form renders")
+    parser.add_argument("--failure-rate", type=float, default=0, help="Share of submissions the server rejects (0-1)")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Use adaptive pacing up to this many submissions/min")
+    parser.add_argument("--http-mode", action="store_true", help="Replay the captured submission over HTTP after one browser run")
+    parser.add_argument("--lean", action="store_true", help="Use the lean resource-blocking browser profile")
+    run(parser.parse_args())
@@ -0,0 +1,45 @@
+"""Benchmark emails/minute for the browser worker pool against the local form.
+
+Usage:
+    python benchmarks/bench_worker_pool.py --emails 40 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Keep the selector cache and job store out of the repo's .cache/ and data/; removed when the benchmark exits
+SCRATCH_DIR = tempfile.TemporaryDirectory(prefix="bench-worker-pool-")
+os.environ.setdefault('MAVEN_CACHE_DIR', os.path.join(SCRATCH_DIR.name, "cache"))
+os.environ.setdefault('MAVEN_DATA_DIR', os.path.join(SCRATCH_DIR.name, "data"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from local_form import start_server  # noqa: E402
+import main  # noqa: E402
+
+
+def run(num_emails, worker_counts, delay):
+    server = start_server()
+    emails = [f"bench{i}@example.com" for i in range(num_emails)]
+    print(f"Local form: {server.url}")
+    print(f"{'workers':>8} {'seconds':>10} {'emails/min':>12} {'success':>8}")
+
+    try:
+        for num_workers in worker_counts:
+            started = time.perf_counter()
+            results = main.run_signup_pool(emails, server.url, delay, num_workers=num_workers)
+            elapsed = time.perf_counter() - started
+            success = len([r for r in results if r['status'] == 'success'])
+            print(f"{num_workers:>8} {elapsed:>10.1f} {success / elapsed * 60:>12.1f} {success:>8}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--emails", type=int, default=40, help="Number of emails to submit per run")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to compare")
+    parser.add_argument("--delay", type=float, default=0, help="Delay between emails in seconds")
+    args = parser.parse_args()
+    run(args.emails, args.workers, args.delay)
@@ -0,0 +1,176 @@
+"""Local stand-in for the Maven signup page used by the benchmarks.
+
+Serves a small HTML page with the same email input and "Sign up for free"
+button the automation looks for, and counts the signups it receives.
+
+The page can be made harder to automate: render_delay holds the form back
+like a slow client-side render, failure_rate makes the signup endpoint
+reject a share of submissions, and email_input/button pick which of the
+automation's fallback selectors is the one that matches. The footer
+newsletter form is a decoy for the generic input[type=email] selector and
+can be left out with newsletter=False. assets=True adds the weight of a real
+course page (hero image, web font, promo video and an analytics script), and
+server.bytes_sent counts what browsers downloaded.
+"""
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Markup for each email input variant, named after the selector it exercises
+EMAIL_INPUT_VARIANTS = {
+    'placeholder': '<input type="text" name="email" placeholder="Your email">',
+    'type-email': '<input type="email" name="email">',
+    'placeholder-ci': '<input type="text" name="email" placeholder="Enter your Email address">',
+    'name': '<input type="text" name="subscriber_email">',
+    'id': '<input type="text" id="signup-email">',
+}
+
+# Markup for each submit button variant, in the automation's fallback order
+BUTTON_VARIANTS = {
+    'sign-up-for-free': '<button type="submit">Sign up for free</button>',
+    'sign-up': '<button type="submit">Sign up now</button>',
+    'input-submit': '<input type="submit" value="Join">',
+    'button-submit': '<button type="submit">Join</button>',
+    'class-submit': '<button type="button" class="btn submit" onclick="submitSignup()">Join</button>',
+    'link': '<a href="#" onclick="submitSignup(); return false;">Sign up</a>',
+}
+
+# Paths, content types and sizes of the heavy page assets
+ASSETS = {
+    '/assets/hero.png': ('image/png', 400 * 1024),
+    '/assets/brand.woff2': ('font/woff2', 120 * 1024),
+    '/assets/promo.mp4': ('video/mp4', 1024 * 1024),
+    '/analytics.js': ('application/javascript', 60 * 1024),
+}
+
+ASSET_MARKUP = """<style>
+    @font-face { font-family: Brand; src: url('/assets/brand.woff2') format('woff2'); }
+    h1 { font-family: Brand, sans-serif; }
+  </style>
+  <img src="/assets/hero.png" width="800" height="400" alt="Course hero">
+  <video src="/assets/promo.mp4" preload="auto" muted></video>
+  <script src="/analytics.js"></script>"""
+
+NEWSLETTER_FOOTER = """<footer>
+    <form id="newsletter-form">
+      <input type="email" name="newsletter" placeholder="Newsletter email">
+    </form>
+  </footer>"""
+
+SIGNUP_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Local Maven Signup</title></head>
+<body>
+  <h1>Context Engineering (local replica)</h1>
+  %(assets)s
+  <div id="signup-slot"></div>
+  <div id="confirmation" style="display:none">You're signed up!</div>
+  %(footer)s
+  <script>
+    function submitSignup() {
+      var form = document.getElementById('signup-form');
+      var email = form.querySelector('input:not([type=submit])').value;
+      fetch('/signup', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({email: email})
+      }).then(function (response) {
+        if (response.ok) {
+          document.getElementById('confirmation').style.display = 'block';
+        }
+      });
+    }
+    function renderForm() {
+      document.getElementById('signup-slot').innerHTML =
+        '<form id="signup-form">' + %(email_input)s + %(button)s + '</form>';
+      document.getElementById('signup-form').addEventListener('submit', function (event) {
+        event.preventDefault();
+        submitSignup();
+      });
+    }
+    setTimeout(renderForm, %(render_delay_ms)d);
+  </script>
+</body>
+</html>
+"""
+
+
+class SignupHandler(BaseHTTPRequestHandler):
+    """Serve the signup page and record submitted emails"""
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path in ASSETS:
+            content_type, size = ASSETS[path]
+            # Comment-only script, so the analytics asset parses but does nothing
+            body = b"/*" + b" " * (size - 4) + b"*/" if path.endswith(".js") else b"\0" * size
+        elif path == "/":
+            content_type, body = "text/html; charset=utf-8", self.server.page.encode("utf-8")
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        accepted = random.random() >= self.server.failure_rate
+        with self.server.lock:
+            (self.server.signups if accepted else self.server.rejected).append(payload.get("email"))
+        body = b'{"ok": true}' if accepted else b'{"ok": false, "error": "try again later"}'
+        self.send_response(200 if accepted else 503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+
+def render_page(render_delay=0.0, email_input='placeholder', button='sign-up-for-free', newsletter=True, assets=False):
+    """Build the signup page HTML for one input/button variant"""
+    return SIGNUP_PAGE % {
+        'email_input': json.dumps(EMAIL_INPUT_VARIANTS[email_input]),
+        'button': json.dumps(BUTTON_VARIANTS[button]),
+        'render_delay_ms': int(render_delay * 1000),
+        'footer': NEWSLETTER_FOOTER if newsletter else '',
+        'assets': ASSET_MARKUP if assets else '',
+    }
+
+
+def start_server(port=0, render_delay=0.0, failure_rate=0.0, email_input='placeholder', button='sign-up-for-free',
+                 newsletter=True, assets=False):
+    """Start the local signup server in a background thread and return it.
+
+    render_delay is in seconds; failure_rate is the share (0-1) of
+    submissions answered with HTTP 503 and recorded in server.rejected.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), SignupHandler)
+    server.page = render_page(render_delay, email_input, button, newsletter, assets)
+    server.failure_rate = failure_rate
+    server.bytes_sent = 0
+    server.signups = []
+    server.rejected = []
+    server.lock = threading.Lock()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    server = start_server(8765)
+    print(f"Serving local signup form at {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -2,27 +2,70 @@ import streamlit as st
 import pandas as pd
 import openai
 import re
+import requests
 import time
+import argparse
+import asyncio
+import subprocess
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, InvalidArgumentException
+import atexit
+import gzip
+import hashlib
+import html
 import json
+import logging
+import math
 import os
+import queue
+import random
+import shutil
+import signal
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import uuid
+import weakref
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from logging.handlers import RotatingFileHandler
+from urllib.parse import quote_plus, urlsplit
+from requests.adapters import HTTPAdapter
 import traceback
 
-# Page configuration
-st.set_page_config(
-    page_title="Maven Email Automation",
-    page_icon="📧",
-    layout="wide"
-)
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Older Streamlit releases
+    add_script_run_ctx = get_script_run_ctx = None
+
+try:
+    import psutil  # Optional: browser memory tracking
+except ImportError:
+    psutil = None
+
+try:
+    import websockets  # Optional: multi-context CDP engine
+except ImportError:
+    websockets = None
+
+try:
+    import pyarrow  # Optional: multi-threaded CSV/JSON parsing
+except ImportError:
+    pyarrow = None
 
 # Custom CSS for better styling - Updated to match dark theme with orange accents
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -167,61 +210,166 @@ st.markdown("""
         padding: 1rem !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Root directory for the per-session Chrome profiles
+CHROME_USER_DATA_ROOT = os.path.join(tempfile.gettempdir(), "chrome-user-data")
+
+# Persistent caches (selectors, ...) survive across runs
+CACHE_DIR = os.environ.get('MAVEN_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+# Durable job state (checkpointed results)
+DATA_DIR = os.environ.get('MAVEN_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+# Logging: a bounded in-memory ring buffer for the UI, the full log in a rotating file
+LOG_BUFFER_SIZE = 500
+LOG_DISPLAY_LINES = 50
+LOG_FILE_PATH = os.path.join(DATA_DIR, "logs", "automation.log")
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+# Leading markers of our log messages and the level they imply
+LOG_LEVEL_MARKERS = (
+    ('❌', logging.ERROR),
+    ('💥', logging.ERROR),
+    ('⚠️', logging.WARNING),
+    ('📋 Full error trace', logging.DEBUG),
+    ('📄 Page source', logging.DEBUG),
+)
+
+def get_logger():
+    """Process-wide logger writing to the console and a rotating log file"""
+    logger = logging.getLogger("maven_automation")
+    if not logger.handlers:
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        
+        console = logging.StreamHandler()
+        console.setLevel(logging.INFO)
+        console.setFormatter(logging.Formatter("[%(asctime)s.%(msecs)03d] %(message)s", "%H:%M:%S"))
+        logger.addHandler(console)
+        
+        try:
+            os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
+            file_handler = RotatingFileHandler(LOG_FILE_PATH, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8')
+            file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+            logger.addHandler(file_handler)
+        except OSError as e:
+            print(f"⚠️ File logging disabled: {str(e)}")
+    return logger
+
+def _infer_level(message):
+    """Level implied by a message's leading marker (after any [W1], [C3], [HTTP] ... tag)"""
+    core = re.sub(r'^(\[[^\]]*\] )+', '', message)
+    for marker, level in LOG_LEVEL_MARKERS:
+        if core.startswith(marker):
+            return level
+    return logging.INFO
+
+class LogBuffer:
+    """Ring buffer of structured log records.
 
-def debug_log(message, log_container=None):
-    """Enhanced debug logging function"""
+    Appending is O(1); views show only the last LOG_DISPLAY_LINES records
+    at INFO or above.
+    """
+    
+    def __init__(self, maxlen=LOG_BUFFER_SIZE):
+        self.records = deque(maxlen=maxlen)
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def add_log(self, record):
+        self.records.append(record)
+    
+    def lines(self, limit=LOG_DISPLAY_LINES, min_level=logging.INFO):
+        records = [r for r in list(self.records) if r['level'] >= min_level]
+        return [r['line'] for r in records[-limit:]]
+    
+    def html(self, limit=LOG_DISPLAY_LINES):
+        return f'<div class="debug-log">{"<br>".join(html.escape(line) for line in self.lines(limit))}</div>'
+
+def debug_log(message, log_container=None, level=None):
+    """Enhanced debug logging function.
+
+    Every message goes to the console/rotating log file, and to
+    log_container when it is a log sink with add_log (a job's LogBuffer, a
+    LogCollector).
+    """
+    level = level if level is not None else _infer_level(message)
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-    debug_message = f"[{timestamp}] {message}"
+    record = {
+        'time': timestamp,
+        'level': level,
+        'message': message,
+        'line': f"[{timestamp}] {message}"
+    }
     
-    # Print to console
-    print(debug_message)
+    get_logger().log(level, message)
     
-    # Also display in Streamlit if container provided
-    if log_container:
-        if 'debug_messages' not in st.session_state:
-            st.session_state.debug_messages = []
-        st.session_state.debug_messages.append(debug_message)
-        
-        # Keep only last 50 messages to prevent memory issues
-        if len(st.session_state.debug_messages) > 50:
-            st.session_state.debug_messages = st.session_state.debug_messages[-50:]
-        
-        log_container.markdown(
-            f'<div class="debug-log">{"<br>".join(st.session_state.debug_messages)}</div>',
-            unsafe_allow_html=True
-        )
+    # Background jobs collect their own log
+    if log_container is not None:
+        log_container.add_log(record)
+
+class LogCollector:
+    """Log sink for debug_log that simply keeps the message lines"""
+    
+    def __init__(self):
+        self.messages = []
+    
+    def add_log(self, record):
+        self.messages.append(record['line'])
+
+OPENAI_MODEL = "gpt-3.5-turbo"
+
+EMAIL_EXTRACTION_PROMPT = "You are an email extraction expert. Extract all valid email addresses from the given text. Return only the emails, one per line, without any additional text or formatting."
+
+# Chunking and concurrency for large files
+EXTRACTION_CHUNK_TOKENS = 1500
+EXTRACTION_MAX_CONCURRENCY = int(os.environ.get('OPENAI_MAX_CONCURRENCY', 4))
+EXTRACTION_MAX_RETRIES = 5
+CHARS_PER_TOKEN = 4  # Rough estimate for English/CSV text
+
+EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
 
 def extract_emails_from_text(text):
     """Extract emails from text using regex pattern"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
+    emails = re.findall(EMAIL_PATTERN, text)
     return list(set(emails))  # Remove duplicates
 
+def _openai_extract_chunk(client, text, max_retries=EXTRACTION_MAX_RETRIES):
+    """Ask the model for the emails in one chunk, retrying rate limits and transient errors with backoff"""
+    for attempt in range(max_retries + 1):
+        try:
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": EMAIL_EXTRACTION_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": f"Extract all email addresses from this text:\n\n{text}"
+                    }
+                ],
+                # Room to list every address in the chunk
+                max_tokens=EXTRACTION_CHUNK_TOKENS + 100,
+                temperature=0
+            )
+            extracted_text = response.choices[0].message.content.strip()
+            return [email.strip() for email in extracted_text.split('\n') if '@' in email]
+        
+        except (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError):
+            if attempt == max_retries:
+                raise
+            time.sleep(min(30, 2 ** attempt) + random.uniform(0, 1))
+
 def extract_emails_with_openai(text, api_key):
     """Extract emails using OpenAI API for better accuracy"""
     try:
-        client = openai.OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an email extraction expert. Extract all valid email addresses from the given text. Return only the emails, one per line, without any additional text or formatting."
-                },
-                {
-                    "role": "user",
-                    "content": f"Extract all email addresses from this text:\n\n{text}"
-                }
-            ],
-            max_tokens=500,
-            temperature=0
-        )
-        
-        # Extract emails from the response
-        extracted_text = response.choices[0].message.content.strip()
-        emails = [email.strip() for email in extracted_text.split('\n') if '@' in email]
+        client = openai.OpenAI(api_key=api_key, max_retries=0)
+        emails = _openai_extract_chunk(client, text)
         
         # Also use regex as backup
         regex_emails = extract_emails_from_text(text)
@@ -235,180 +383,555 @@ def extract_emails_with_openai(text, api_key):
         # Fallback to regex extraction
         return extract_emails_from_text(text)
 
-def process_csv_file(uploaded_file, api_key):
-    """Process uploaded CSV file and extract emails"""
-    try:
-        # Read CSV file
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
+def split_into_chunks(df, chunk_tokens=EXTRACTION_CHUNK_TOKENS):
+    """Split a DataFrame into CSV text chunks of about chunk_tokens tokens, each starting with the header row"""
+    header = ','.join(str(column) for column in df.columns)
+    budget = chunk_tokens * CHARS_PER_TOKEN
+    chunks, lines, size = [], [], len(header)
+    
+    for line in df.to_csv(index=False, header=False).splitlines():
+        if lines and size + len(line) + 1 > budget:
+            chunks.append('\n'.join([header] + lines))
+            lines, size = [], len(header)
+        lines.append(line)
+        size += len(line) + 1
+    
+    if lines:
+        chunks.append('\n'.join([header] + lines))
+    return chunks
+
+def extract_emails_chunked(df, api_key, max_concurrency=EXTRACTION_MAX_CONCURRENCY, chunk_tokens=EXTRACTION_CHUNK_TOKENS):
+    """Extract emails from every row of df with concurrent, token-budgeted OpenAI calls.
+
+    Each chunk is also scanned with the regex, so a chunk whose API call
+    fails after all retries still contributes its regex matches. Returns the
+    deduplicated emails (in first-seen order) and a stats dict.
+    """
+    started = time.perf_counter()
+    chunks = split_into_chunks(df, chunk_tokens)
+    client = openai.OpenAI(api_key=api_key, max_retries=0)
+    failures = []
+    
+    def extract_chunk(chunk):
+        regex_emails = extract_emails_from_text(chunk)
+        try:
+            return _openai_extract_chunk(client, chunk) + regex_emails
+        except Exception as e:
+            failures.append(str(e))
+            return regex_emails
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="openai-extract") as executor:
+        chunk_results = list(executor.map(extract_chunk, chunks))
+    
+    emails = list(dict.fromkeys(email for chunk_emails in chunk_results for email in chunk_emails))
+    elapsed = time.perf_counter() - started
+    
+    stats = {
+        'rows': len(df),
+        'chunks': len(chunks),
+        'failed_chunks': len(failures),
+        'errors': failures[:5],
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round(len(df) / elapsed, 1) if elapsed > 0 else None
+    }
+    return emails, stats
+
+# Column-aware fast path: header names that hint at an email column
+EMAIL_COLUMN_HINTS = ('email', 'e-mail', 'mail')
+EMAIL_COLUMN_SAMPLE_SIZE = 1000
+
+# Cells that might still hold an (obfuscated) address worth asking the model about
+POSSIBLE_EMAIL_PATTERN = r'@|\bat\b|\[at\]|\(at\)'
+
+def detect_email_columns(df, sample_size=EMAIL_COLUMN_SAMPLE_SIZE, min_ratio=0.5, hinted_min_ratio=0.1):
+    """Return the text columns whose sampled values are mostly emails.
+
+    Columns with an email-like header need a lower match ratio than
+    unnamed/other columns.
+    """
+    columns = []
+    for column in df.columns:
+        if not pd.api.types.is_object_dtype(df[column]) and not pd.api.types.is_string_dtype(df[column]):
+            continue
+        
+        values = df[column].dropna()
+        if values.empty:
+            continue
+        sample = values.sample(n=min(sample_size, len(values)), random_state=0).astype(str)
+        
+        ratio = sample.str.contains(EMAIL_PATTERN, regex=True).mean()
+        hinted = any(hint in str(column).lower() for hint in EMAIL_COLUMN_HINTS)
+        if ratio >= (hinted_min_ratio if hinted else min_ratio):
+            columns.append(column)
+    return columns
+
+def extract_emails_from_columns(df, columns):
+    """Vectorized extraction from the given columns.
+
+    Returns the unique emails in first-seen order and a Series of the
+    non-empty cells that had no regex match but may still hold an address.
+    """
+    values = pd.concat([df[column].dropna().astype(str) for column in columns], ignore_index=True)
+    found = values.str.extractall(f'({EMAIL_PATTERN})')[0]
+    emails = pd.unique(found).tolist()
+    
+    unmatched = values[~values.index.isin(found.index.get_level_values(0))]
+    leftovers = unmatched[unmatched.str.contains(POSSIBLE_EMAIL_PATTERN, case=False, regex=True)]
+    return emails, leftovers
+
+def extract_emails_from_dataframe(df, api_key=None):
+    """Extract emails from a DataFrame, using the LLM only where the fast path finds nothing.
+
+    Files with a detectable email column are handled entirely with pandas
+    string operations; only leftover cells that look like they might contain
+    an address go to OpenAI. Files without one use the chunked LLM path.
+    """
+    started = time.perf_counter()
+    columns = detect_email_columns(df)
+    
+    if not columns:
+        if api_key:
+            emails, stats = extract_emails_chunked(df, api_key)
+            stats['mode'] = 'llm'
         else:
-            # Try to read as CSV anyway
-            df = pd.read_csv(uploaded_file)
+            emails = extract_emails_from_text(df.to_csv(index=False))
+            stats = {'mode': 'regex', 'chunks': 0, 'failed_chunks': 0, 'errors': []}
+        stats.update(columns=[], llm_cells=0)
+    else:
+        emails, leftovers = extract_emails_from_columns(df, columns)
+        stats = {'mode': 'columns', 'columns': columns, 'llm_cells': 0, 'chunks': 0, 'failed_chunks': 0, 'errors': []}
+        
+        if len(leftovers) and api_key:
+            stats['llm_cells'] = len(leftovers)
+            llm_emails, llm_stats = extract_emails_chunked(leftovers.to_frame('value'), api_key)
+            emails = list(dict.fromkeys(emails + llm_emails))
+            stats.update(chunks=llm_stats['chunks'], failed_chunks=llm_stats['failed_chunks'], errors=llm_stats['errors'])
+    
+    elapsed = time.perf_counter() - started
+    stats.update(
+        rows=len(df),
+        seconds=round(elapsed, 3),
+        rows_per_second=round(len(df) / elapsed, 1) if elapsed > 0 else None
+    )
+    return emails, stats
+
+# Pre-submission validation: RFC 5322 dot-atom subset, with the usual length limits
+EMAIL_ADDRESS_PATTERN = (
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z]{2,63}"
+)
+EMAIL_MAX_LENGTH = 254
+EMAIL_LOCAL_MAX_LENGTH = 64
+EMAIL_WRAPPING_CHARS = " \t\r\n<>()[]{}\"'`,;:."
+
+# Optional domain lists, one domain per line; entries also cover their subdomains
+DOMAIN_ALLOWLIST_PATH = os.environ.get('EMAIL_DOMAIN_ALLOWLIST', os.path.join(DATA_DIR, "domain_allowlist.txt"))
+DOMAIN_DENYLIST_PATH = os.environ.get('EMAIL_DOMAIN_DENYLIST', os.path.join(DATA_DIR, "domain_denylist.txt"))
+
+def load_domain_list(path):
+    """Read a domain list file, skipping blank lines and # comments; empty set if missing"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return {line.split('#', 1)[0].strip().lower().lstrip('@') for line in f} - {''}
+    except OSError:
+        return set()
+
+def _domain_matches(domains, listed):
+    """Boolean Series: domain equals a listed domain or is a subdomain of one"""
+    pattern = r'(?:^|\.)(?:' + '|'.join(re.escape(domain) for domain in sorted(listed)) + r')$'
+    return domains.str.contains(pattern, regex=True)
+
+def validate_emails(emails, allowlist=None, denylist=None):
+    """Normalize, validate and dedupe addresses before they reach the browser.
+
+    Strips whitespace, wrapping punctuation and mailto: prefixes, lowercases,
+    checks the syntax and length limits, drops case-insensitive duplicates
+    and applies the domain allow/deny lists (loaded from their files when
+    not given). Works on a pandas Series, so large lists stay fast.
+    Returns (valid_emails, report).
+    """
+    allowlist = load_domain_list(DOMAIN_ALLOWLIST_PATH) if allowlist is None else set(allowlist)
+    denylist = load_domain_list(DOMAIN_DENYLIST_PATH) if denylist is None else set(denylist)
+    
+    raw = pd.Series(list(emails), dtype=str)
+    normalized = (raw.str.strip()
+                  .str.replace(r'^mailto:', '', regex=True, case=False)
+                  .str.strip(EMAIL_WRAPPING_CHARS)
+                  .str.lower())
+    local_parts = normalized.str.rsplit('@', n=1).str[0]
+    domains = normalized.str.rsplit('@', n=1).str[-1]
+    
+    reasons = pd.Series(None, index=raw.index, dtype=object)
+    valid_syntax = (normalized.str.fullmatch(EMAIL_ADDRESS_PATTERN)
+                    & (normalized.str.len() <= EMAIL_MAX_LENGTH)
+                    & (local_parts.str.len() <= EMAIL_LOCAL_MAX_LENGTH))
+    reasons[~valid_syntax] = 'invalid syntax'
+    if denylist:
+        reasons[reasons.isna() & _domain_matches(domains, denylist)] = 'denied domain'
+    if allowlist:
+        reasons[reasons.isna() & ~_domain_matches(domains, allowlist)] = 'domain not allowed'
+    reasons[reasons.isna() & normalized.duplicated()] = 'duplicate'
+    
+    kept = reasons.isna()
+    rejected = pd.DataFrame({'email': raw[~kept], 'reason': reasons[~kept]})
+    report = {
+        'input': len(raw),
+        'valid': int(kept.sum()),
+        'normalized': int((kept & (normalized != raw)).sum()),
+        'invalid': int((reasons == 'invalid syntax').sum()),
+        'denied': int((reasons == 'denied domain').sum()),
+        'not_allowed': int((reasons == 'domain not allowed').sum()),
+        'duplicates': int((reasons == 'duplicate').sum()),
+        'avoided': int((~kept).sum()),
+        'allowlist': len(allowlist),
+        'denylist': len(denylist),
+        'rejected': rejected.to_dict('records'),
+    }
+    return normalized[kept].tolist(), report
+
+# Uploads above this size are streamed in chunks instead of loaded whole
+STREAMING_THRESHOLD_BYTES = int(os.environ.get('STREAMING_THRESHOLD_MB', 20)) * 1024 * 1024
+STREAM_CHUNK_ROWS = 50_000
+PREVIEW_ROWS = 10
+
+def iter_csv_emails(file, api_key=None, chunk_rows=STREAM_CHUNK_ROWS, preview_rows=PREVIEW_ROWS, read_options=None):
+    """Read a CSV chunk by chunk and yield (new_emails, stats) after each chunk.
+
+    Only the current chunk, the first preview_rows rows and the set of
+    emails already seen are held in memory, so peak memory stays flat no
+    matter how long the file is. read_options (sep, compression, usecols)
+    are passed on to pd.read_csv.
+    """
+    seen = set()
+    stats = {'rows': 0, 'chunks': 0, 'failed_chunks': 0, 'preview': None}
+    
+    for chunk in pd.read_csv(file, chunksize=chunk_rows, dtype=str, **(read_options or {})):
+        if stats['preview'] is None:
+            stats['preview'] = chunk.head(preview_rows).copy()
+        
+        chunk_emails, chunk_stats = extract_emails_from_dataframe(chunk, api_key)
+        new_emails = [email for email in chunk_emails if email not in seen]
+        seen.update(new_emails)
+        
+        stats['rows'] += len(chunk)
+        stats['chunks'] += 1
+        stats['failed_chunks'] += chunk_stats['failed_chunks']
+        yield new_emails, stats
+
+# Extraction results cached on disk by upload content
+EXTRACTION_CACHE_DIR = os.path.join(CACHE_DIR, "extractions")
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_MB', 100)) * 1024 * 1024
+EXTRACTION_CACHE_VERSION = 1  # Bump when extraction logic changes
+
+class ExtractionCache:
+    """Size-bounded, least-recently-used disk cache of extraction results.
+
+    Entries are keyed by a hash of the file bytes plus the extraction mode
+    and model, so the same upload never pays for a second OpenAI call.
+    """
+    
+    def __init__(self, directory=EXTRACTION_CACHE_DIR, max_bytes=EXTRACTION_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(data, mode):
+        content_digest = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{content_digest}:{mode}:{OPENAI_MODEL}:{EXTRACTION_CACHE_VERSION}".encode('utf-8')).hexdigest()
+    
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def get(self, key):
+        """Return (emails, preview_df) for a cached key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
         
-        # Convert DataFrame to string for processing
-        csv_text = df.to_string(index=False)
+        with self._lock:
+            self.hits += 1
+        preview = pd.read_json(StringIO(entry['preview']), orient='split', dtype=False)
+        preview.attrs['total_rows'] = entry['total_rows']
+        return entry['emails'], preview
+    
+    def put(self, key, emails, df):
+        entry = {
+            'emails': emails,
+            'preview': df.head(PREVIEW_ROWS).to_json(orient='split', index=False),
+            'total_rows': df.attrs.get('total_rows', len(df)),
+            'created': datetime.now().isoformat()
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            print(f"⚠️ Could not write extraction cache: {str(e)}")
+    
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+    
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        with self._lock:
+            self.hits = self.misses = 0
+
+@st.cache_resource
+def get_extraction_cache():
+    """Process-wide extraction cache (shared hit/miss counters)"""
+    return ExtractionCache()
+
+def process_csv_streaming(uploaded_file, api_key, out=st, read_options=None):
+    """Stream a large CSV upload, showing emails as they are found; returns (emails, preview_df, stats).
+
+    Streaming bounds parse memory and keeps the progress caption live; the
+    emails are still collected into one list, because automation only starts
+    once the extracted list has been validated and reviewed.
+    """
+    progress = out.empty()
+    started = time.perf_counter()
+    emails, stats = [], {'rows': 0, 'failed_chunks': 0, 'preview': None}
+    
+    for new_emails, stats in iter_csv_emails(uploaded_file, api_key, read_options=read_options):
+        emails.extend(new_emails)
+        progress.caption(f"📥 Streaming: {stats['rows']:,} rows read, {len(emails):,} unique emails so far")
+    
+    elapsed = time.perf_counter() - started
+    progress.caption(
+        f"⚡ Streamed {stats['rows']:,} rows in {elapsed:.1f}s "
+        f"({stats['rows'] / elapsed if elapsed > 0 else 0:,.0f} rows/s)"
+    )
+    
+    # Keep only the preview rows, remembering the full row count
+    preview = stats['preview'] if stats['preview'] is not None else pd.DataFrame()
+    preview.attrs['total_rows'] = stats['rows']
+    return emails, preview, stats
+
+def process_csv_file(uploaded_file, api_key, out=st):
+    """Process an uploaded contact export (CSV, TSV, JSON lines or xlsx, optionally gzipped) and extract emails.
+
+    Progress and problems are reported through out, which is the Streamlit
+    module in the app and a ConsoleOutput on the command line.
+    """
+    try:
+        # Identical uploads are answered from the extraction cache
+        cache = get_extraction_cache()
+        cache_key = cache.make_key(uploaded_file.getbuffer(), 'llm' if api_key else 'regex')
+        cached = cache.get(cache_key)
+        if cached:
+            out.caption("⚡ Loaded from extraction cache (no API calls)")
+            return cached
+        
+        emails, df, failed_chunks = _extract_upload(uploaded_file, api_key, out)
         
-        # Extract emails using OpenAI API
-        emails = extract_emails_with_openai(csv_text, api_key)
+        # Only complete results are worth reusing
+        if emails and not failed_chunks:
+            cache.put(cache_key, emails, df)
         
         return emails, df
         
     except Exception as e:
-        st.error(f"Error processing CSV file: {str(e)}")
+        out.error(f"Error processing CSV file: {str(e)}")
         return [], None
 
-def test_chrome_setup():
-    """Test Chrome driver setup with detailed debugging"""
-    debug_messages = []
+# Upload sniffing: compression from the magic bytes, format from the first decoded bytes
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'  # xlsx workbooks are zip containers
+SNIFF_BYTES = 64 * 1024
+DELIMITERS = (',', '\t', ';', '|')
+UPLOAD_TYPES = ['csv', 'tsv', 'txt', 'jsonl', 'ndjson', 'xlsx', 'gz']
+
+# Full parses use the multi-threaded pyarrow engine when it is installed (None = pandas default)
+PARSER_ENGINE = 'pyarrow' if pyarrow else None
+
+def sniff_upload(uploaded_file):
+    """Work out an upload's format from its content; returns {'format', 'sep', 'compression'}.
+
+    gzip is recognized by its magic bytes and looked inside, xlsx by the zip
+    signature. Text is JSON lines when the first line is an object, and
+    otherwise delimited by whichever of DELIMITERS its header uses most.
+    """
+    head = bytes(uploaded_file.getbuffer()[:SNIFF_BYTES])
+    spec = {'format': 'delimited', 'sep': ',', 'compression': None}
+    if head.startswith(GZIP_MAGIC):
+        spec['compression'] = 'gzip'
+        head = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(head, SNIFF_BYTES)
+    if head.startswith(ZIP_MAGIC):
+        spec['format'] = 'xlsx'
+        return spec
     
-    def log_debug(msg):
-        debug_messages.append(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
-        print(msg)
+    text = head.decode('utf-8', errors='replace').lstrip('\ufeff')
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), '')
+    if first_line.startswith('{'):
+        spec['format'] = 'jsonl'
+    else:
+        spec['sep'] = max(DELIMITERS, key=first_line.count)
+    return spec
+
+def describe_upload(spec):
+    """Short human-readable name of a sniffed format, e.g. 'gzip TSV'"""
+    if spec['format'] == 'delimited':
+        name = {',': 'CSV', '\t': 'TSV'}.get(spec['sep'], f"'{spec['sep']}'-delimited text")
+    else:
+        name = {'jsonl': 'JSON lines', 'xlsx': 'Excel workbook'}[spec['format']]
+    return f"{spec['compression']} {name}" if spec['compression'] else name
+
+def read_upload(uploaded_file, spec, usecols=None, nrows=None):
+    """Parse an upload into a DataFrame of strings, keeping only usecols when given.
+
+    Full reads of delimited and JSON lines files use PARSER_ENGINE; reads
+    limited to nrows (samples) use the default engine, which stops early.
+    """
+    uploaded_file.seek(0)
+    if spec['format'] == 'xlsx':
+        # Workbooks are zip archives that need seeking, which a gzip stream can't do backwards
+        source = BytesIO(gzip.decompress(uploaded_file.read())) if spec['compression'] == 'gzip' else uploaded_file
+        return pd.read_excel(source, dtype=str, usecols=usecols, nrows=nrows)
     
-    try:
-        log_debug("🔍 Starting Chrome driver test...")
-        
-        # Detect environment
-        import platform
-        is_windows = platform.system().lower() == "windows"
-        is_render = os.environ.get('RENDER', False)
-        
-        log_debug(f"🔍 Environment detected: {'Windows' if is_windows else 'Linux/Render'}")
-        
-        # Configure Chrome options based on environment
-        chrome_options = Options()
-        
-        if is_windows:
-            # Windows-specific options
-            log_debug("🪟 Using Windows Chrome configuration")
-            chrome_options.add_argument('--start-maximized')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            
-            # Windows user data directory
-            import tempfile
-            temp_dir = tempfile.gettempdir()
-            chrome_options.add_argument(f'--user-data-dir={temp_dir}/chrome-user-data')
-            chrome_options.add_argument(f'--disk-cache-dir={temp_dir}/chrome-cache')
-            
+    if spec['format'] == 'jsonl':
+        # The pyarrow JSON reader ignores compression, so hand every engine a decompressed stream
+        source = gzip.GzipFile(fileobj=uploaded_file) if spec['compression'] == 'gzip' else uploaded_file
+        if nrows is not None or PARSER_ENGINE is None:
+            df = pd.read_json(source, lines=True, nrows=nrows, dtype=False)
         else:
-            # Linux/Render options
-            log_debug("🐧 Using Linux/Render Chrome configuration")
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            
-            if is_render:
-                chrome_options.binary_location = "/usr/bin/google-chrome"
-        
-        log_debug("✓ Chrome options configured")
-        
-        # Try webdriver-manager first (works on both platforms)
-        try:
-            log_debug("📦 Trying webdriver-manager...")
-            from webdriver_manager.chrome import ChromeDriverManager
-            from selenium.webdriver.chrome.service import Service
-            
-            log_debug("✓ webdriver-manager imported successfully")
-            
-            service = Service(ChromeDriverManager().install())
-            log_debug("✓ ChromeDriver service created")
-            
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            log_debug("✅ Chrome driver initialized successfully with webdriver-manager!")
-            
-            # Test navigation
-            driver.get("https://www.google.com")
-            log_debug("✅ Test navigation successful")
-            
-            driver.quit()
-            log_debug("✅ Chrome driver test completed successfully!")
-            return True, debug_messages
-            
-        except Exception as e:
-            log_debug(f"❌ webdriver-manager failed: {str(e)}")
-            log_debug(f"Full error: {traceback.format_exc()}")
-            
-            # Try system ChromeDriver on Linux/Render
-            if not is_windows:
-                log_debug("🔄 Trying system ChromeDriver on Linux...")
-                try:
-                    from selenium.webdriver.chrome.service import Service
-                    
-                    chrome_driver_path = "/usr/local/bin/chromedriver"
-                    log_debug(f"🔧 Using system ChromeDriver: {chrome_driver_path}")
-                    
-                    service = Service(chrome_driver_path)
-                    log_debug("✓ ChromeDriver service created")
-                    
-                    driver = webdriver.Chrome(service=service, options=chrome_options)
-                    log_debug("✅ Chrome driver initialized successfully with system ChromeDriver!")
-                    
-                    # Test navigation
-                    driver.get("https://www.google.com")
-                    log_debug("✅ Test navigation successful")
-                    
-                    driver.quit()
-                    log_debug("✅ Chrome driver test completed successfully!")
-                    return True, debug_messages
-                    
-                except Exception as e2:
-                    log_debug(f"❌ System ChromeDriver also failed: {str(e2)}")
-                    log_debug(f"Full error: {traceback.format_exc()}")
-            
-            # Final fallback - direct initialization
-            log_debug("🔄 Trying direct Chrome driver...")
-            try:
-                driver = webdriver.Chrome(options=chrome_options)
-                log_debug("✅ Chrome driver initialized with direct method!")
-                
-                # Test navigation
-                driver.get("https://www.google.com")
-                log_debug("✅ Test navigation successful")
-                
-                driver.quit()
-                log_debug("✅ Chrome driver test completed successfully!")
-                return True, debug_messages
-                
-            except Exception as e3:
-                log_debug(f"❌ Direct Chrome driver also failed: {str(e3)}")
-                log_debug(f"Full error: {traceback.format_exc()}")
-                return False, debug_messages
-                
-    except Exception as e:
-        log_debug(f"❌ Critical error in Chrome setup test: {str(e)}")
-        log_debug(f"Full error: {traceback.format_exc()}")
-        return False, debug_messages
+            df = pd.read_json(source, lines=True, engine=PARSER_ENGINE)
+        df = df[usecols] if usecols is not None else df
+        # Strings like the CSV path's dtype=str; missing values stay missing instead of becoming 'nan'
+        return df.astype(str).where(df.notna())
+    
+    options = {'sep': spec['sep'], 'compression': spec['compression'], 'usecols': usecols, 'dtype': str}
+    if nrows is not None or PARSER_ENGINE is None:
+        return pd.read_csv(uploaded_file, nrows=nrows, **options)
+    return pd.read_csv(uploaded_file, engine=PARSER_ENGINE, **options)
 
-def automate_maven_signup(emails, maven_url, delay_between_emails=2, log_container=None):
-    """Automate Maven signup process with enhanced debugging"""
+def _extract_upload(uploaded_file, api_key, out=st):
+    """Read an upload and extract its emails; returns (emails, preview_df, failed_chunks)"""
+    spec = sniff_upload(uploaded_file)
     
-    debug_log(f"🚀 STARTING MAVEN AUTOMATION", log_container)
-    debug_log(f"📧 Number of emails to process: {len(emails)}", log_container)
-    debug_log(f"⏱️ Delay between emails: {delay_between_emails} seconds", log_container)
-    debug_log(f"📋 Email list: {emails[:3]}{'...' if len(emails) > 3 else ''}", log_container)
+    # Find the email columns on a small sample, so the full parse can skip every other column
+    sample = read_upload(uploaded_file, spec, nrows=EMAIL_COLUMN_SAMPLE_SIZE)
+    columns = detect_email_columns(sample) or None
+    preview = sample.head(PREVIEW_ROWS).copy()
     
-    if not emails:
-        debug_log("❌ ERROR: No emails provided to process!", log_container)
-        return []
+    # Large delimited uploads are streamed; only the preview rows are kept
+    if spec['format'] == 'delimited' and uploaded_file.size > STREAMING_THRESHOLD_BYTES:
+        uploaded_file.seek(0)
+        read_options = {'sep': spec['sep'], 'compression': spec['compression'], 'usecols': columns}
+        emails, _, stats = process_csv_streaming(uploaded_file, api_key, out, read_options)
+        preview.attrs['total_rows'] = stats['rows']
+        return emails, preview, stats['failed_chunks']
+    
+    started = time.perf_counter()
+    df = read_upload(uploaded_file, spec, usecols=columns)
+    out.caption(
+        f"📂 Parsed {len(df):,} rows of {describe_upload(spec)} in {time.perf_counter() - started:.2f}s "
+        f"(read {len(df.columns)} of {len(sample.columns)} columns)"
+    )
+    preview.attrs['total_rows'] = len(df)
     
-    # Detect environment (Windows vs Linux/Render)
-    import platform
-    is_windows = platform.system().lower() == "windows"
-    is_render = os.environ.get('RENDER', False)
+    # Extract emails from email columns directly, falling back to OpenAI
+    emails, stats = extract_emails_from_dataframe(df, api_key)
     
-    debug_log(f"🔍 Environment detected: {'Windows' if is_windows else 'Linux/Render'}", log_container)
+    if stats['mode'] == 'columns':
+        out.caption(
+            f"⚡ Read emails from column(s) {', '.join(map(str, stats['columns']))} in {stats['seconds']}s "
+            f"({stats['rows_per_second']} rows/s); {stats['llm_cells']} leftover cells sent to OpenAI"
+        )
+    else:
+        out.caption(
+            f"⚡ Scanned {stats['rows']} rows in {stats['chunks']} chunks in {stats['seconds']}s "
+            f"({stats['rows_per_second']} rows/s)"
+        )
+    if stats['failed_chunks']:
+        out.warning(
+            f"⚠️ OpenAI extraction failed for {stats['failed_chunks']} of {stats['chunks']} chunks; "
+            f"regex results were used for those. First error: {stats['errors'][0]}"
+        )
+    
+    return emails, preview, stats['failed_chunks']
+
+def test_chrome_setup():
+    """Test Chrome driver setup with detailed debugging.
+
+    Uses the shared session manager, so a successful test leaves a warm
+    browser behind for the next automation job.
+    """
+    log = LogCollector()
     
-    # Configure Chrome options based on environment
+    try:
+        debug_log("🔍 Starting Chrome driver test...", log)
+        
+        manager = get_session_manager()
+        session = manager.acquire(log)
+        
+        healthy = session.healthy()
+        if healthy:
+            debug_log(f"✅ Browser responded to health check (Chrome {session.driver.capabilities.get('browserVersion', 'unknown')})", log)
+        else:
+            debug_log("❌ Browser did not respond to health check", log)
+        
+        manager.release(session, log, healthy=healthy)
+        
+        if healthy:
+            debug_log("✅ Chrome driver test completed successfully!", log)
+        return healthy, log.messages
+        
+    except Exception as e:
+        debug_log(f"❌ Critical error in Chrome setup test: {str(e)}", log)
+        debug_log(f"Full error: {traceback.format_exc()}", log)
+        return False, log.messages
+
+def _find_free_port():
+    """Ask the OS for a free local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def build_chrome_options(is_windows, is_render, profile_dir, debugging_port=None, log_container=None, capture_network=False,
+                         lean=False):
+    """Build Chrome options for one browser session.
+
+    Every session gets its own profile directory and remote debugging port so
+    several browsers can run side by side without fighting over the same
+    profile lock or port. capture_network turns on the performance log, which
+    records every network request for HTTP replay calibration. lean disables
+    images and returns from navigation as soon as the DOM is ready; the URL
+    blocking half of the lean profile is applied by apply_resource_blocking.
+    """
     chrome_options = Options()
     
+    if capture_network:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    
+    if lean:
+        debug_log("🪶 Using lean browser profile (no images, eager page load)", log_container)
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        chrome_options.page_load_strategy = 'eager'
+    
     if is_windows:
         # Windows-specific options
         debug_log("🪟 Using Windows Chrome configuration", log_container)
@@ -419,14 +942,6 @@ def automate_maven_signup(emails, maven_url, delay_between_emails=2, log_contain
         chrome_options.add_argument('--disable-web-security')
         chrome_options.add_argument('--allow-running-insecure-content')
         
-        # Windows user data directory
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        chrome_options.add_argument(f'--user-data-dir={temp_dir}/chrome-user-data')
-        chrome_options.add_argument(f'--data-path={temp_dir}/chrome-data-path')
-        chrome_options.add_argument(f'--disk-cache-dir={temp_dir}/chrome-cache')
-        chrome_options.add_argument(f'--media-cache-dir={temp_dir}/chrome-media-cache')
-        
     else:
         # Linux/Render options
         debug_log("🐧 Using Linux/Render Chrome configuration", log_container)
@@ -439,7 +954,8 @@ def automate_maven_signup(emails, maven_url, delay_between_emails=2, log_contain
         chrome_options.add_argument('--allow-running-insecure-content')  # Allow insecure content
         
         # Additional options for stability
-        chrome_options.add_argument('--remote-debugging-port=9222')
+        if debugging_port:
+            chrome_options.add_argument(f'--remote-debugging-port={debugging_port}')
         chrome_options.add_argument('--disable-background-timer-throttling')
         chrome_options.add_argument('--disable-backgrounding-occluded-windows')
         chrome_options.add_argument('--disable-renderer-backgrounding')
@@ -450,272 +966,2736 @@ def automate_maven_signup(emails, maven_url, delay_between_emails=2, log_contain
         if is_render:
             chrome_options.binary_location = "/usr/bin/google-chrome"
         
-        # Set user data directory to avoid conflicts
-        chrome_options.add_argument('--user-data-dir=/tmp/chrome-user-data')
-        chrome_options.add_argument('--data-path=/tmp/chrome-data-path')
         chrome_options.add_argument('--homedir=/tmp')
-        chrome_options.add_argument('--disk-cache-dir=/tmp/chrome-cache')
-        chrome_options.add_argument('--media-cache-dir=/tmp/chrome-media-cache')
         chrome_options.add_argument('--disk-cache-size=1')
         chrome_options.add_argument('--media-cache-size=1')
         chrome_options.add_argument('--aggressive-cache-discard')
         chrome_options.add_argument('--memory-pressure-off')
         chrome_options.add_argument('--max_old_space_size=4096')
     
+    # Per-session profile and cache directories to avoid conflicts
+    chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    chrome_options.add_argument(f'--data-path={os.path.join(profile_dir, "data-path")}')
+    chrome_options.add_argument(f'--disk-cache-dir={os.path.join(profile_dir, "cache")}')
+    chrome_options.add_argument(f'--media-cache-dir={os.path.join(profile_dir, "media-cache")}')
+    
     chrome_options.add_argument('--verbose')  # More verbose logging
     
     debug_log("✓ Chrome options configured", log_container)
-    
-    driver = None
-    results = []
-    
+    return chrome_options
+
+# Requests the lean profile blocks: images, fonts, media, analytics and embeds
+LEAN_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*facebook.net*', '*connect.facebook.com*',
+    '*segment.com*', '*segment.io*', '*hotjar.com*', '*mixpanel.com*', '*amplitude.com*', '*fullstory.com*',
+    '*intercom.io*', '*intercomcdn.com*', '*sentry.io*', '*clarity.ms*',
+    '*youtube.com/embed*', '*player.vimeo.com*', '*wistia.com*', '*wistia.net*',
+    '*/analytics.js*', '*/gtag/js*',
+]
+
+def apply_resource_blocking(driver, log_container=None):
+    """Block LEAN_BLOCKED_URLS for every later navigation of this browser via CDP"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        debug_log(f"🪶 Blocking {len(LEAN_BLOCKED_URLS)} URL patterns (images, fonts, media, analytics)", log_container)
+    except Exception as e:
+        debug_log(f"⚠️ Could not set up URL blocking: {str(e)}", log_container)
+
+def resolve_chromedriver_path(is_windows, log_container=None):
+    """Find a ChromeDriver binary: webdriver-manager first, then the system one.
+
+    Returns None when neither is available, leaving Selenium to locate a
+    driver itself.
+    """
+    # Try webdriver-manager first (works on both Windows and Linux)
     try:
-        debug_log("🔧 Attempting to initialize Chrome driver...", log_container)
+        debug_log("📦 Trying webdriver-manager...", log_container)
+        from webdriver_manager.chrome import ChromeDriverManager
         
-        # Try webdriver-manager first (works on both Windows and Linux)
+        chrome_driver_path = ChromeDriverManager().install()
+        debug_log(f"✓ ChromeDriver downloaded to: {chrome_driver_path}", log_container)
+        return chrome_driver_path
+        
+    except Exception as e:
+        debug_log(f"❌ webdriver-manager failed: {str(e)}", log_container)
+    
+    # Use system ChromeDriver installed during build on Linux/Render
+    if not is_windows:
+        chrome_driver_path = os.environ.get('CHROMEDRIVER_PATH', "/usr/local/bin/chromedriver")
+        if os.path.exists(chrome_driver_path):
+            debug_log(f"🔧 Using system ChromeDriver: {chrome_driver_path}", log_container)
+            return chrome_driver_path
+    
+    debug_log("🔄 No ChromeDriver binary found, Selenium will locate one itself", log_container)
+    return None
+
+def create_chrome_driver(chrome_options, driver_path=None, log_container=None):
+    """Start Chrome with the resolved ChromeDriver, falling back to direct initialization"""
+    debug_log("🔧 Attempting to initialize Chrome driver...", log_container)
+    
+    if driver_path:
         try:
-            debug_log("📦 Trying webdriver-manager...", log_container)
-            from webdriver_manager.chrome import ChromeDriverManager
             from selenium.webdriver.chrome.service import Service
             
-            chrome_driver_path = ChromeDriverManager().install()
-            debug_log(f"✓ ChromeDriver downloaded to: {chrome_driver_path}", log_container)
-            
-            service = Service(chrome_driver_path)
-            debug_log("✓ ChromeDriver service created", log_container)
-            
+            service = Service(driver_path)
             driver = webdriver.Chrome(service=service, options=chrome_options)
-            debug_log("✅ Chrome driver initialized successfully with webdriver-manager!", log_container)
+            debug_log(f"✅ Chrome driver initialized successfully with {driver_path}!", log_container)
+            return driver
             
         except Exception as e:
-            debug_log(f"❌ webdriver-manager failed: {str(e)}", log_container)
+            debug_log(f"❌ ChromeDriver at {driver_path} failed: {str(e)}", log_container)
             debug_log(f"📋 Full error trace: {traceback.format_exc()}", log_container)
-            
-            # Try system ChromeDriver on Linux/Render
-            if not is_windows:
-                debug_log("🔄 Trying system ChromeDriver on Linux...", log_container)
-                try:
-                    from selenium.webdriver.chrome.service import Service
-                    
-                    # Use system ChromeDriver installed during build
-                    chrome_driver_path = "/usr/local/bin/chromedriver"
-                    debug_log(f"🔧 Using system ChromeDriver: {chrome_driver_path}", log_container)
-                    
-                    service = Service(chrome_driver_path)
-                    debug_log("✓ ChromeDriver service created", log_container)
-                    
-                    driver = webdriver.Chrome(service=service, options=chrome_options)
-                    debug_log("✅ Chrome driver initialized successfully with system ChromeDriver!", log_container)
-                    
-                except Exception as e2:
-                    debug_log(f"❌ System ChromeDriver also failed: {str(e2)}", log_container)
-                    debug_log(f"📋 Full error trace: {traceback.format_exc()}", log_container)
-            
-            # Final fallback - direct initialization
-            if 'driver' not in locals():
-                debug_log("🔄 Trying direct Chrome driver initialization...", log_container)
-                try:
-                    driver = webdriver.Chrome(options=chrome_options)
-                    debug_log("✅ Chrome driver initialized successfully with direct method!", log_container)
-                except Exception as e3:
-                    debug_log(f"❌ All Chrome initialization methods failed!", log_container)
-                    debug_log(f"📋 Final error: {str(e3)}", log_container)
-                    raise Exception(f"All Chrome initialization methods failed. Last error: {str(e3)}")
-        
-        # Test that driver is working
-        debug_log("🧪 Testing driver with simple navigation...", log_container)
-        driver.get("https://www.google.com")
-        debug_log(f"✓ Test navigation successful. Current URL: {driver.current_url}", log_container)
-        
-        # Navigate to Maven website
-        maven_url = 'https://maven.com/p/1f7efa/context-engineering-agentic-rag-for-product-managers?utm_medium=ll_share_link&utm_source=instructor'
-        debug_log(f"🌐 Navigating to Maven website: {maven_url}", log_container)
-        driver.get(maven_url)
+    
+    # Final fallback - direct initialization
+    debug_log("🔄 Trying direct Chrome driver initialization...", log_container)
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+        debug_log("✅ Chrome driver initialized successfully with direct method!", log_container)
+        return driver
+    except Exception as e:
+        debug_log(f"❌ All Chrome initialization methods failed!", log_container)
+        debug_log(f"📋 Final error: {str(e)}", log_container)
+        raise Exception(f"All Chrome initialization methods failed. Last error: {str(e)}")
+
+# Warm browser reuse limits
+BROWSER_MAX_USES = int(os.environ.get('BROWSER_MAX_USES', 20))
+BROWSER_MAX_IDLE = int(os.environ.get('BROWSER_MAX_IDLE', 2))
+BROWSER_MAX_MEMORY_GROWTH_MB = int(os.environ.get('BROWSER_MAX_MEMORY_GROWTH_MB', 300))
+
+class BrowserSession:
+    """A running Chrome instance together with its private profile directory"""
+    
+    def __init__(self, driver, profile_dir, capture_network=False, lean=False):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.capture_network = capture_network
+        self.lean = lean
+        self.uses = 0
+        self.baseline_memory_mb = self.memory_mb()
+    
+    def memory_mb(self):
+        """Resident memory of chromedriver and every Chrome process under it (None without psutil)"""
+        if psutil is None:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+    
+    def healthy(self):
+        """Cheap liveness check: one script round trip"""
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error closing browser: {str(e)}")
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+def _frame_origins(frame_tree):
+    """Web origins of a page and its iframes, from a CDP Page.getFrameTree tree"""
+    origins = set()
+    origin = frame_tree['frame'].get('securityOrigin')
+    if origin and origin.startswith('http'):
+        origins.add(origin)
+    for child in frame_tree.get('childFrames', []):
+        origins |= _frame_origins(child)
+    return origins
+
+class BrowserSessionManager:
+    """Keeps warm browsers alive between jobs.
+
+    The ChromeDriver binary is resolved once per process. Released browsers
+    are reset and parked for the next job, and they are recycled after
+    max_uses jobs or once their memory has grown by max_memory_growth_mb.
+    """
+    
+    def __init__(self, max_uses=BROWSER_MAX_USES, max_idle=BROWSER_MAX_IDLE, max_memory_growth_mb=BROWSER_MAX_MEMORY_GROWTH_MB):
+        import platform
+        self.is_windows = platform.system().lower() == "windows"
+        self.is_render = os.environ.get('RENDER', False)
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.launched = 0
+        self.reused = 0
+        self.peak_memory_mb = None  # Largest single-browser footprint seen at release
+        self._idle = []
+        self._lock = threading.Lock()
+        self._driver_path = None
+        self._driver_path_resolved = False
+    
+    def driver_path(self, log_container=None):
+        with self._lock:
+            if not self._driver_path_resolved:
+                self._driver_path = resolve_chromedriver_path(self.is_windows, log_container)
+                self._driver_path_resolved = True
+            return self._driver_path
+    
+    def acquire(self, log_container=None, capture_network=False, lean=False):
+        """Return a healthy warm browser with the requested profile, or launch a new one.
+
+        Browsers with network capture are always launched fresh and never
+        parked, so the performance log never grows in a pooled browser.
+        """
+        if capture_network:
+            return self._launch(log_container, capture_network=True, lean=lean)
         
-        # Wait for the page to load
-        debug_log("⏳ Waiting for page to load...", log_container)
-        time.sleep(5)
+        while True:
+            with self._lock:
+                matching = [idle for idle in self._idle if idle.lean == lean]
+                session = matching[-1] if matching else None
+                if session:
+                    self._idle.remove(session)
+            if session is None:
+                break
+            if session.healthy():
+                self.reused += 1
+                debug_log(f"♻️ Reusing warm browser (used {session.uses} times)", log_container)
+                return session
+            debug_log("🩺 Warm browser failed health check, discarding it", log_container)
+            session.close()
         
-        current_url = driver.current_url
-        page_title = driver.title
-        debug_log(f"✓ Page loaded successfully!", log_container)
-        debug_log(f"📄 Current URL: {current_url}", log_container)
-        debug_log(f"📝 Page title: {page_title}", log_container)
+        return self._launch(log_container, lean=lean)
+    
+    def _launch(self, log_container=None, capture_network=False, lean=False):
+        debug_log(f"🔍 Environment detected: {'Windows' if self.is_windows else 'Linux/Render'}", log_container)
         
-        # Check if page loaded correctly
-        if "maven.com" not in current_url.lower():
-            debug_log("⚠️ WARNING: Might not be on the correct Maven page", log_container)
+        # Each browser gets its own profile directory under the shared root
+        os.makedirs(CHROME_USER_DATA_ROOT, exist_ok=True)
+        profile_dir = tempfile.mkdtemp(prefix="session-", dir=CHROME_USER_DATA_ROOT)
+        debugging_port = None if self.is_windows else _find_free_port()
+        debug_log(f"📁 Browser profile: {profile_dir}", log_container)
         
-        # Process each email
-        for i, email in enumerate(emails):
-            debug_log(f"📧 Processing email {i+1}/{len(emails)}: {email}", log_container)
-            
-            try:
-                # Look for email input field with multiple selectors
-                debug_log("🔍 Looking for email input field...", log_container)
-                wait = WebDriverWait(driver, 15)
-                
-                email_input = None
-                selectors_to_try = [
-                    'input[placeholder="Your email"][type="text"]',
-                    'input[type="email"]',
-                    'input[placeholder*="email" i]',
-                    'input[name*="email" i]',
-                    'input[id*="email" i]'
-                ]
-                
-                for selector in selectors_to_try:
-                    try:
-                        debug_log(f"🔍 Trying selector: {selector}", log_container)
-                        email_input = wait.until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        debug_log(f"✅ Found email input with selector: {selector}", log_container)
-                        break
-                    except TimeoutException:
-                        debug_log(f"❌ Selector failed: {selector}", log_container)
-                        continue
-                
-                if not email_input:
-                    debug_log("❌ ERROR: Could not find email input field with any selector!", log_container)
-                    
-                    # Debug: Print page source snippet
-                    page_source_snippet = driver.page_source[:1000]
-                    debug_log(f"📄 Page source snippet: {page_source_snippet}...", log_container)
-                    
-                    results.append({
-                        'email': email,
-                        'status': 'error',
-                        'timestamp': datetime.now().isoformat(),
-                        'message': 'Email input field not found'
-                    })
-                    continue
-                
-                # Clear and fill the input
-                debug_log(f"✏️ Clearing and entering email: {email}", log_container)
-                email_input.clear()
-                time.sleep(0.5)  # Small delay after clear
-                email_input.send_keys(email)
-                
-                # Verify email was entered
-                entered_value = email_input.get_attribute('value')
-                debug_log(f"✓ Email entered. Field value: {entered_value}", log_container)
-                
-                if entered_value != email:
-                    debug_log(f"⚠️ WARNING: Entered value '{entered_value}' doesn't match expected '{email}'", log_container)
-                
-                # Wait for input to register
-                time.sleep(1)
-                
-                # Look for submit button with multiple approaches
-                debug_log("🔍 Looking for submit button...", log_container)
-                
-                submit_button = None
-                button_selectors = [
-                    "//button[contains(text(), 'Sign up for free')]",
-                    "//button[contains(text(), 'Sign up')]",
-                    "//input[@type='submit']",
-                    "//button[@type='submit']",
-                    "//button[contains(@class, 'submit')]",
-                    "//a[contains(text(), 'Sign up')]"
-                ]
-                
-                for selector in button_selectors:
-                    try:
-                        debug_log(f"🔍 Trying button selector: {selector}", log_container)
-                        submit_button = wait.until(
-                            EC.element_to_be_clickable((By.XPATH, selector))
-                        )
-                        debug_log(f"✅ Found submit button with selector: {selector}", log_container)
-                        break
-                    except TimeoutException:
-                        debug_log(f"❌ Button selector failed: {selector}", log_container)
-                        continue
-                
-                if submit_button:
-                    debug_log("🖱️ Clicking submit button...", log_container)
-                    submit_button.click()
-                    debug_log(f"✅ Form submitted successfully for: {email}", log_container)
-                    
-                    # Record success
-                    results.append({
-                        'email': email,
-                        'status': 'success',
-                        'timestamp': datetime.now().isoformat(),
-                        'message': 'Form submitted successfully'
-                    })
-                    
-                    # Brief wait to see any page response
-                    time.sleep(2)
-                    
-                    # After successful submission - refresh page to reset form state
-                    debug_log("🔄 Refreshing page to reset form state...", log_container)
-                    driver.refresh()
-                    debug_log("⏳ Waiting for page to fully reload...", log_container)
-                    time.sleep(3)  # Wait for page to fully reload
-                    
-                    # Wait for form to be ready again
-                    debug_log("🔍 Waiting for form to be ready after refresh...", log_container)
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="email"]')))
-                    debug_log("✅ Form is ready for next email", log_container)
-                    
-                else:
-                    debug_log(f"❌ ERROR: Submit button not found for: {email}", log_container)
-                    results.append({
-                        'email': email,
-                        'status': 'error',
-                        'timestamp': datetime.now().isoformat(),
-                        'message': 'Submit button not found'
-                    })
-                
-                # Wait between submissions
-                if i < len(emails) - 1:
-                    debug_log(f"⏳ Waiting {delay_between_emails} seconds before next email...", log_container)
-                    time.sleep(delay_between_emails)
-                
-            except Exception as e:
-                error_msg = f"Error processing {email}: {str(e)}"
-                debug_log(f"❌ {error_msg}", log_container)
-                debug_log(f"📋 Full error trace: {traceback.format_exc()}", log_container)
-                
-                results.append({
-                    'email': email,
-                    'status': 'error',
-                    'timestamp': datetime.now().isoformat(),
-                    'message': str(e)
-                })
+        try:
+            chrome_options = build_chrome_options(self.is_windows, self.is_render, profile_dir, debugging_port, log_container,
+                                                  capture_network, lean)
+            driver = create_chrome_driver(chrome_options, self.driver_path(log_container), log_container)
+            if lean:
+                apply_resource_blocking(driver, log_container)
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
         
-        debug_log("🎉 All emails processed successfully!", log_container)
-        debug_log(f"📊 Final results: {len(results)} total, {len([r for r in results if r['status'] == 'success'])} successful, {len([r for r in results if r['status'] == 'error'])} errors", log_container)
+        self.launched += 1
+        return BrowserSession(driver, profile_dir, capture_network, lean)
+    
+    def release(self, session, log_container=None, healthy=True):
+        """Park a browser for reuse, or close it if it errored, is worn out or the idle pool is full"""
+        session.uses += 1
+        reason = None
         
-        return results
+        memory = session.memory_mb()
+        if memory is not None:
+            self.peak_memory_mb = max(memory, self.peak_memory_mb or 0)
+        if not healthy:
+            reason = "it hit a critical error"
+        elif session.capture_network:
+            reason = "it was launched for network capture"
+        elif session.uses >= self.max_uses:
+            reason = f"it reached {self.max_uses} uses"
+        elif memory is not None and session.baseline_memory_mb is not None \
+                and memory - session.baseline_memory_mb > self.max_memory_growth_mb:
+            reason = f"memory grew to {memory:.0f} MB"
         
-    except Exception as e:
-        error_msg = f"Critical error occurred: {str(e)}"
-        debug_log(f"💥 {error_msg}", log_container)
-        debug_log(f"📋 Full error trace: {traceback.format_exc()}", log_container)
+        if reason is None:
+            try:
+                # Leave nothing from this job behind for the next one: every domain's cookies, and the
+                # storage (localStorage, sessionStorage, IndexedDB, caches) of each frame's origin
+                driver = session.driver
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                for origin in _frame_origins(driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']):
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+                driver.get("about:blank")
+            except Exception:
+                reason = "resetting it failed"
         
-        # Add error to results if we have emails but hit a critical error
-        if emails and not results:
-            results = [{
-                'email': email,
-                'status': 'error',
-                'timestamp': datetime.now().isoformat(),
-                'message': f"Critical automation error: {str(e)}"
-            } for email in emails]
+        if reason is None:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(session)
+                    debug_log("✓ Browser kept warm for the next job", log_container)
+                    return
+            reason = "the idle pool is full"
         
-        return results
+        debug_log(f"🔄 Closing browser because {reason}...", log_container)
+        session.close()
+    
+    def shutdown(self):
+        with self._lock:
+            sessions, self._idle = self._idle, []
+        for session in sessions:
+            session.close()
+
+@st.cache_resource
+def get_session_manager():
+    """Process-wide browser session manager"""
+    manager = BrowserSessionManager()
+    atexit.register(manager.shutdown)
+    return manager
+
+# Per-step timeout budget (seconds) for the readiness waits
+READINESS_TIMEOUTS = {
+    'page_load': 20,
+    'network_idle': 10,
+    'form_rendered': 15,
+}
+
+# Quiet period after the last request before the page counts as network idle
+NETWORK_IDLE_MS = 300
+
+# Counts in-flight fetch/XHR requests so we can tell when a submission has settled,
+# and keeps the HTTP status of every response since the last submit (0 = network error)
+NETWORK_TRACKER_JS = """
+if (!window.__mavenNet) {
+    var net = window.__mavenNet = {pending: 0, last: Date.now(), mark: 0, statuses: []};
+    var done = function () { net.pending = Math.max(0, net.pending - 1); net.last = Date.now(); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            net.pending++; net.last = Date.now();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { net.statuses.push(response.status); return response; },
+                function (error) { net.statuses.push(0); throw error; }
+            ).finally(done);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        net.pending++; net.last = Date.now();
+        this.addEventListener('loadend', function () { net.statuses.push(this.status); done(); });
+        return originalSend.apply(this, arguments);
+    };
+}
+"""
+
+class ReadinessWaiter:
+    """Wait for explicit page conditions instead of fixed sleeps.
+
+    Every wait has its own timeout budget from READINESS_TIMEOUTS, and the
+    time each step actually took is kept in ``timings`` so runs can be
+    compared against the old fixed pacing.
+    """
+    
+    def __init__(self, driver, timeouts=None, poll_frequency=0.05):
+        self.driver = driver
+        self.timeouts = {**READINESS_TIMEOUTS, **(timeouts or {})}
+        self.poll_frequency = poll_frequency
+        self.timings = {}
+        # With an eager page load strategy the DOM is all we wait for
+        eager = driver.capabilities.get('pageLoadStrategy') == 'eager'
+        self.ready_states = ('interactive', 'complete') if eager else ('complete',)
+    
+    def _wait(self, step, condition, required=False):
+        """Wait for condition within the step's budget; return False on timeout unless required"""
+        started = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, self.timeouts[step], poll_frequency=self.poll_frequency).until(condition)
+            return True
+        except TimeoutException:
+            if required:
+                raise
+            return False
+        finally:
+            self.timings[step] = round(self.timings.get(step, 0) + time.perf_counter() - started, 3)
+    
+    def take_timings(self):
+        """Return the timings recorded since the last call and start over"""
+        timings, self.timings = self.timings, {}
+        return timings
+    
+    def document_ready(self):
+        """Wait for document.readyState to be complete (or interactive when eager) and install the network tracker"""
+        ready = self._wait('page_load', lambda d: d.execute_script("return document.readyState") in self.ready_states)
+        self.driver.execute_script(NETWORK_TRACKER_JS)
+        return ready
+    
+    def form_rendered(self, locator):
+        """Wait until the form element is present again; raises TimeoutException if it never is"""
+        return self._wait('form_rendered', EC.presence_of_element_located(locator), required=True)
+
+# Candidate locators for the signup form, in order of preference
+EMAIL_INPUT_SELECTORS = [
+    'input[placeholder="Your email"][type="text"]',
+    'input[type="email"]',
+    'input[placeholder*="email" i]',
+    'input[name*="email" i]',
+    'input[id*="email" i]'
+]
+
+SUBMIT_BUTTON_SELECTORS = [
+    "//button[contains(text(), 'Sign up for free')]",
+    "//button[contains(text(), 'Sign up')]",
+    "//input[@type='submit']",
+    "//button[@type='submit']",
+    "//button[contains(@class, 'submit')]",
+    "//a[contains(text(), 'Sign up')]"
+]
+
+SELECTOR_CACHE_PATH = os.path.join(CACHE_DIR, "selector_cache.json")
+
+def _selector_cache_key(url):
+    """Cache key for a target page: the URL without query string or fragment"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+def load_selector_cache(cache_path=SELECTOR_CACHE_PATH):
+    """Load the persisted selector cache, or an empty one if it is missing or unreadable"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+class SelectorResolver:
+    """Remember which email input and submit button locators win on each page.
+
+    The submit agent checks all candidates in the page, cached winner first,
+    instead of waiting out a timeout per selector. The winners are cached
+    per target URL on disk, so later emails (and later runs against the same
+    page) hit the cached locator straight away.
+    """
+    
+    _file_lock = threading.Lock()
+    
+    def __init__(self, url, cache_path=SELECTOR_CACHE_PATH, timeout=15):
+        self.url = url
+        self.key = _selector_cache_key(url)
+        self.cache_path = cache_path
+        self.timeout = timeout
+        self.entry = load_selector_cache(cache_path).get(self.key, {})
+    
+    @property
+    def input_selector(self):
+        return self.entry.get('input')
+    
+    def ordered(self, role, candidates):
+        """Candidates for a role with the cached winner first"""
+        cached = self.entry.get(role)
+        return [cached] + [c for c in candidates if c != cached] if cached else list(candidates)
+    
+    def remember(self, role, selector, log):
+        """Record the selector that matched, saving the cache if it changed"""
+        cached = self.entry.get(role)
+        if selector != cached:
+            if cached:
+                log(f"♻️ Cached {role} selector no longer matches: {cached}")
+            log(f"✅ Resolved {role} selector: {selector}")
+            self.entry[role] = selector
+            self._save()
+    
+    def _save(self):
+        """Merge this page's entry into the cache file (atomic replace)"""
+        with self._file_lock:
+            cache = load_selector_cache(self.cache_path)
+            cache[self.key] = {**self.entry, 'updated': datetime.now().isoformat()}
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, indent=2)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                print(f"⚠️ Could not save selector cache: {str(e)}")
+
+# Page text that reads like the signup went through, or like the page refused it
+CONFIRMATION_PATTERN = r"thank|you'?re (in|signed|registered|all set)|success|check your (inbox|email)|confirm|subscribed|welcome|signed up|registered|on the list|already"
+PAGE_ERROR_PATTERN = r"invalid|not a valid|error|try again|failed|went wrong|too many"
+
+# How long to keep watching for a confirmation once the network has settled
+CONFIRMATION_GRACE_MS = 1500
+
+# In-page submit agent: finds the field and button, fills in the address with real input
+# events, clicks, and watches the DOM for the page's answer with a MutationObserver.
+# Resolves to a plain object, so each email costs one round trip to the browser.
+SUBMIT_AGENT_JS = NETWORK_TRACKER_JS + """
+var email = arguments[0], inputs = arguments[1], buttons = arguments[2];
+var formTimeout = arguments[3], settleTimeout = arguments[4], idleMs = arguments[5], graceMs = arguments[6];
+var confirmPattern = new RegExp(arguments[7], 'i'), errorPattern = new RegExp(arguments[8], 'i');
+var sleep = function (ms) { return new Promise(function (resolve) { setTimeout(resolve, ms); }); };
+var first = function (candidates, kind, clickable) {
+    for (var i = 0; i < candidates.length; i++) {
+        var el = kind === 'xpath'
+            ? document.evaluate(candidates[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(candidates[i]);
+        if (el && (!clickable || (el.offsetParent !== null && !el.disabled))) { return [i, el]; }
+    }
+    return null;
+};
+var started = Date.now(), timings = {};
+var deadline = started + formTimeout, input = null, button = null;
+while (!(input = first(inputs, 'css', false)) && Date.now() < deadline) { await sleep(50); }
+if (!input) { return {status: 'error', message: 'Email input field not found'}; }
+while (!(button = first(buttons, 'xpath', true)) && Date.now() < deadline) { await sleep(50); }
+if (!button) { return {status: 'error', message: 'Submit button not found', input: input[0]}; }
+timings.lookup = Date.now() - started;
+
+// Use the native setter so framework-controlled inputs see the change
+var field = input[1];
+field.focus();
+Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(field, email);
+field.dispatchEvent(new Event('input', {bubbles: true}));
+field.dispatchEvent(new Event('change', {bubbles: true}));
+timings.fill = Date.now() - started - timings.lookup;
+if (field.value !== email) {
+    return {status: 'error', message: "Entered value '" + field.value + "' doesn't match", input: input[0], button: button[0]};
+}
+if (field.checkValidity && !field.checkValidity()) {
+    return {status: 'error', message: 'Page reported: ' + field.validationMessage, invalid: true, input: input[0], button: button[0]};
+}
+
+// The page's answer shows up next to the form or in an alert/live region; text anywhere
+// else (carousels, toasts, testimonials changing class) is not about this submission
+var LIVE_REGIONS = '[role="alert"], [role="status"], [aria-live]:not([aria-live="off"]), [role="dialog"], dialog';
+var branch = field.closest('form') || field;
+while (branch.parentElement && branch.parentElement !== document.body && branch.parentElement.children.length === 1) {
+    branch = branch.parentElement;
+}
+var container = branch.parentElement;
+// Forms placed straight in <body>: only the form's wrapper and the elements right beside it
+var nearRoots = container && container !== document.body && container !== document.documentElement
+    ? [container] : [branch, branch.previousElementSibling, branch.nextElementSibling].filter(Boolean);
+var nearForm = function (el) { return nearRoots.some(function (n) { return n.contains(el); }); };
+var textOf = function (el) { return (el.innerText || '').replace(/\\s+/g, ' ').trim().slice(0, 200); };
+
+// Text already on screen before the click (say, a confirmation the page never hid) is not an answer
+var shownBefore = {};
+nearRoots.concat(Array.prototype.slice.call(document.querySelectorAll(LIVE_REGIONS))).forEach(function (root) {
+    [root].concat(Array.prototype.slice.call(root.querySelectorAll('*'))).forEach(function (el) {
+        if (!el.contains(field) && el.getClientRects().length) { shownBefore[textOf(el)] = true; }
+    });
+});
+
+var confirmation = null, confirmationEl = null, pageError = null;
+var check = function (el) {
+    if (el.contains(field) || !el.getClientRects().length) { return; }
+    var text = textOf(el);
+    if (!text || shownBefore[text]) { return; }
+    if (errorPattern.test(text)) { pageError = pageError || text; }
+    else if (confirmPattern.test(text) && !confirmation) { confirmation = text; confirmationEl = el; }
+};
+var inspect = function (node) {
+    var el = node.nodeType === 1 ? node : node.parentElement;
+    if (!el) { return; }
+    if (nearForm(el) || el.closest(LIVE_REGIONS)) { check(el); } else { el.querySelectorAll(LIVE_REGIONS).forEach(check); }
+};
+var observer = new MutationObserver(function (mutations) {
+    mutations.forEach(function (m) {
+        if (m.type === 'childList') { m.addedNodes.forEach(inspect); } else { inspect(m.target); }
+    });
+});
+observer.observe(document.body || document.documentElement, {childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ['style', 'class', 'hidden', 'aria-hidden', 'open']});
+
+var tracker = window.__mavenNet;
+tracker.mark = Date.now();
+tracker.statuses = [];
+var clicked = Date.now();
+button[1].click();
+var settledAt = null;
+while (!pageError && Date.now() < clicked + settleTimeout) {
+    await sleep(50);
+    if (!settledAt && document.readyState === 'complete' && tracker.pending === 0 && Date.now() - Math.max(tracker.last, tracker.mark) >= idleMs) {
+        settledAt = Date.now();
+        timings.network_idle = settledAt - clicked;
+    }
+    if (settledAt && (confirmation || Date.now() - settledAt >= graceMs)) { break; }
+}
+observer.disconnect();
+timings.confirmation = Date.now() - clicked;
+// Tag the confirmation so the form reset can dismiss it before the next email
+if (confirmationEl) { confirmationEl.setAttribute('data-maven-confirmation', ''); }
+return {status: pageError ? 'error' : 'success', message: pageError ? 'Page reported: ' + pageError : null,
+        confirmation: confirmation, input: input[0], button: button[0], settled: settledAt !== null, started: started, clicked: clicked,
+        statuses: tracker.statuses.slice(), timings: timings};
+"""
+
+# execute_async_script hands the result to a callback instead of awaiting a returned promise
+SELENIUM_SUBMIT_AGENT_JS = """
+var done = arguments[arguments.length - 1];
+(async function () {""" + SUBMIT_AGENT_JS + """
+}).apply(null, Array.prototype.slice.call(arguments, 0, -1)).then(done, function (e) {
+    done({status: 'error', message: 'Submit agent failed: ' + e});
+});
+"""
+
+# Text of the page a classic form post landed on, once it has loaded
+LANDED_PAGE_JS = "return document.readyState === 'complete' && document.body ? document.body.innerText : null;"
+
+def landed_page_outcome(text):
+    """Submit agent outcome for a form post that replaced the page, judged from the new page's text"""
+    outcome = {'status': 'success', 'settled': False, 'statuses': []}
+    lines = [' '.join(line.split())[:200] for line in (text or '').splitlines() if line.strip()]
+    page_error = next((line for line in lines if re.search(PAGE_ERROR_PATTERN, line, re.I)), None)
+    if page_error:
+        outcome.update(status='error', message=f"Page reported: {page_error}")
+    else:
+        outcome['confirmation'] = next((line for line in lines if re.search(CONFIRMATION_PATTERN, line, re.I)), None)
+    return outcome
+
+def read_landed_page(driver, timeout):
+    """Wait for the page a form post navigated to and return its text, or None if it never loaded"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            text = driver.execute_script(LANDED_PAGE_JS)
+        except WebDriverException:
+            text = None  # Still between documents
+        if text is not None:
+            return text
+        time.sleep(0.1)
+    return None
+
+def submit_agent_arguments(resolver, email):
+    """Arguments for SUBMIT_AGENT_JS, with the resolver's cached selectors tried first"""
+    return [email, resolver.ordered('input', EMAIL_INPUT_SELECTORS), resolver.ordered('button', SUBMIT_BUTTON_SELECTORS),
+            resolver.timeout * 1000, READINESS_TIMEOUTS['network_idle'] * 1000, NETWORK_IDLE_MS, CONFIRMATION_GRACE_MS,
+            CONFIRMATION_PATTERN, PAGE_ERROR_PATTERN]
+
+def submit_agent_timeout(resolver):
+    """Seconds to allow one submit agent call before giving up on it"""
+    return resolver.timeout + READINESS_TIMEOUTS['network_idle'] + CONFIRMATION_GRACE_MS / 1000 + 5
+
+def remember_agent_selectors(resolver, args, outcome, log):
+    """Cache the input and button selectors the submit agent matched"""
+    if outcome.get('input') is not None:
+        resolver.remember('input', args[1][outcome['input']], log)
+    if outcome.get('button') is not None:
+        resolver.remember('button', args[2][outcome['button']], log)
+
+def run_submit_agent(driver, resolver, email, log):
+    """Submit one email with a single execute_async_script call and return the agent's outcome"""
+    args = submit_agent_arguments(resolver, email)
+    try:
+        outcome = driver.execute_async_script(SELENIUM_SUBMIT_AGENT_JS, *args)
+    except WebDriverException as e:
+        if 'unloaded' not in str(e):
+            raise
+        # A classic form post replaced the page, so the answer is on the new one
+        outcome = landed_page_outcome(read_landed_page(driver, READINESS_TIMEOUTS['page_load']))
+    
+    remember_agent_selectors(resolver, args, outcome, log)
+    return outcome
+
+def agent_result(email, outcome, log):
+    """Turn a submit agent outcome into a result dict"""
+    statuses = outcome.get('statuses') or []
+    confirmation = outcome.get('confirmation')
+    result = {
+        'email': email,
+        'status': outcome['status'],
+        'timestamp': datetime.now().isoformat(),
+        'message': outcome.get('message')
+    }
+    accepted = [status for status in statuses if 200 <= status < 300]
+    if outcome['status'] == 'success':
+        result['confirmed'] = bool(confirmation)
+        if confirmation:
+            result['message'] = f"Confirmed: {confirmation}"
+        elif accepted:
+            result['message'] = f"Server accepted the submission (HTTP {accepted[-1]}); no confirmation shown"
+        if not outcome.get('settled'):
+            log("⚠️ WARNING: Network did not go idle after submit")
+    if confirmation:
+        result['confirmation'] = confirmation
+    if statuses:
+        result['http_statuses'] = statuses
+    if outcome.get('timings'):
+        result['step_timings'] = {step: round(ms / 1000, 3) for step, ms in outcome['timings'].items()}
+    
+    # A submission only counts if the server did not reject it
+    if result['status'] == 'success' and statuses and all(status == 0 or status == 429 or status >= 500 for status in statuses):
+        # Every response was a rejection, so the signup did not go through
+        log(f"❌ ERROR: Server rejected the submission with HTTP {statuses}")
+        result.update(status='error', message=f"Server rejected the submission (HTTP {statuses[-1]})")
+    elif any(status == 0 or status == 429 or status >= 500 for status in statuses):
+        log(f"⚠️ WARNING: Server answered the submission with HTTP {statuses}")
+    if result['status'] == 'success' and not confirmation and not accepted:
+        # A click alone proves nothing; leave the email to the retry rounds and resume
+        log("❌ ERROR: Neither a confirmation nor a 2xx answer after submit")
+        result.update(status='error', message='Form submitted, but neither a confirmation nor a 2xx answer was seen')
+    
+    if result['status'] == 'error':
+        if outcome.get('invalid'):
+            # The browser's own validation refusing the address won't change on retry
+            result['error_kind'] = 'permanent'
+        elif 'settled' in outcome and any(200 <= status < 300 for status in statuses):
+            # Only page text says it failed while the server accepted the request; a retry could sign up twice
+            result['error_kind'] = 'permanent'
+            result['message'] += f" (server answered HTTP {statuses[-1]}, so it is not retried)"
+        else:
+            result['error_kind'] = classify_error(email)
+    return result
+
+def agent_phases(outcome):
+    """The submit agent's own timings as (phase, offset, seconds) sub-phases of its 'submit' phase"""
+    timings = outcome.get('timings') or {}
+    steps = []
+    if 'lookup' in timings:
+        steps.append(('lookup', 0, timings['lookup']))
+    if 'fill' in timings:
+        steps.append(('fill', timings['lookup'], timings['fill']))
+    if 'confirmation' in timings and outcome.get('clicked') and outcome.get('started'):
+        click = outcome['clicked'] - outcome['started']
+        settle = timings.get('network_idle', timings['confirmation'])
+        steps.append(('submit_settle', click, settle))
+        if 'network_idle' in timings:
+            steps.append(('confirmation', click + settle, timings['confirmation'] - settle))
+    return [(name, offset / 1000, ms / 1000) for name, offset, ms in steps]
+
+# Clears the email field, closes open dialogs and hides the confirmation the submit agent
+# tagged, without reloading the page. Returns true only if that confirmation is gone and the
+# cached input and button are still attached, visible and enabled.
+RESET_FORM_IN_PLACE_JS = """
+var inputSelector = arguments[0], buttonXPath = arguments[1];
+var visible = function (el) { return el && el.isConnected && el.offsetParent !== null && !el.disabled; };
+document.querySelectorAll('[role="dialog"] [aria-label*="close" i], [role="dialog"] [data-dismiss], .modal [aria-label*="close" i]')
+    .forEach(function (el) { try { el.click(); } catch (e) {} });
+var lingering = false;
+document.querySelectorAll('[data-maven-confirmation]').forEach(function (el) {
+    el.removeAttribute('data-maven-confirmation');
+    el.style.display = 'none';
+    lingering = lingering || el.getClientRects().length > 0;
+});
+if (lingering) { return false; }
+var input = inputSelector && document.querySelector(inputSelector);
+var button = buttonXPath && document.evaluate(buttonXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!visible(input) || !visible(button)) { return false; }
+// Use the native setter so framework-controlled inputs see the change
+Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(input, '');
+input.dispatchEvent(new Event('input', {bubbles: true}));
+input.dispatchEvent(new Event('change', {bubbles: true}));
+return input.value === '';
+"""
+
+def reset_form(driver, waiter, resolver, log):
+    """Get the form ready for the next email with the cheapest strategy that works.
+
+    'in_place' clears the field, closes dialogs and hides the last
+    confirmation without any network traffic. 're-navigate' loads the
+    target page again when the submission navigated away from it.
+    'refresh' reloads the page when the form could not be restored in
+    place. Returns the strategy used.
+    """
+    if _selector_cache_key(driver.current_url) == resolver.key:
+        if driver.execute_script(RESET_FORM_IN_PLACE_JS, resolver.input_selector, resolver.entry.get('button')):
+            log("♻️ Form reset in place")
+            return 'in_place'
+        log("🔄 Form could not be reset in place, refreshing page...")
+        driver.refresh()
+        strategy = 'refresh'
+    else:
+        log(f"🔄 Submission navigated to {driver.current_url}, going back to the target page...")
+        driver.get(resolver.url)
+        strategy = 're-navigate'
+    
+    log("⏳ Waiting for page to fully reload...")
+    waiter.document_ready()
+    log("🔍 Waiting for form to be ready again...")
+    waiter.form_rendered((By.CSS_SELECTOR, resolver.input_selector or 'input[type="email"]'))
+    return strategy
+
+def pause(seconds, control=None):
+    """Sleep for seconds, ending early if control (a JobControl) is cancelled"""
+    if control:
+        control.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+def deal_round_robin(items, num_shards):
+    """Deal items round-robin into at most num_shards non-empty shards of similar size"""
+    num_shards = max(1, min(int(num_shards), len(items)))
+    return [items[w::num_shards] for w in range(num_shards)]
+
+def run_in_threads(fn, calls, thread_name_prefix):
+    """Run fn(*args) for every args tuple in calls, one thread each, and return the results in order.
+
+    Worker threads get the Streamlit script context so they can still use
+    st; a single call runs on the calling thread.
+    """
+    if len(calls) == 1:
+        return [fn(*calls[0])]
+    
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    
+    def run(args):
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix=thread_name_prefix) as executor:
+        return list(executor.map(run, calls))
+
+class PhaseTimer:
+    """Times named phases of the automation hot path.
+
+    Each finished phase is appended to the shared timeline list as an event
+    with its start offset from the run start, so runs can be exported and
+    summarized per phase. Sub-phases name the phase they are part of in
+    'parent'.
+    """
+    
+    def __init__(self, timeline=None, run_started=None, worker=None):
+        self.timeline = timeline if timeline is not None else []
+        self.run_started = run_started or time.perf_counter()
+        self.worker = worker
+    
+    @contextmanager
+    def phase(self, name, email=None):
+        """Time the body as one phase; yields its perf_counter start for sub_phases"""
+        started = time.perf_counter()
+        try:
+            yield started
+        finally:
+            self.timeline.append({
+                'worker': self.worker,
+                'email': email,
+                'phase': name,
+                'parent': None,
+                'start': round(started - self.run_started, 4),
+                'duration': round(time.perf_counter() - started, 4)
+            })
+    
+    def sub_phases(self, parent, email, started, steps):
+        """Record (name, offset, seconds) steps measured elsewhere inside a phase that began at started"""
+        for name, offset, duration in steps:
+            self.timeline.append({
+                'worker': self.worker,
+                'email': email,
+                'phase': name,
+                'parent': parent,
+                'start': round(started - self.run_started + offset, 4),
+                'duration': round(duration, 4)
+            })
+
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize_timeline(timeline):
+    """Per-phase count, total and p50/p95/p99/max durations (seconds) for a run"""
+    durations = {}
+    for event in timeline:
+        durations.setdefault(event['phase'], []).append(event['duration'])
+    
+    summary = []
+    for phase, values in durations.items():
+        values.sort()
+        summary.append({
+            'phase': phase,
+            'count': len(values),
+            'total': round(sum(values), 3),
+            'p50': _percentile(values, 50),
+            'p95': _percentile(values, 95),
+            'p99': _percentile(values, 99),
+            'max': values[-1]
+        })
+    return sorted(summary, key=lambda row: row['total'], reverse=True)
+
+# Adaptive pacing limits (submissions per minute, shared by all workers of a target)
+RATE_MIN_RPM = 2
+RATE_INCREASE_RPM = 2  # Additive step after every quick success
+RATE_SLOW_FACTOR = 0.8  # Multiplicative cut after a slow response
+RATE_BACKOFF_FACTOR = 0.5  # Multiplicative cut after an error or an HTTP 429/5xx answer
+RATE_SLOW_SECONDS = 3.0  # Submit settle time that counts as a slow response
+
+class RateController:
+    """AIMD pacing shared by every worker of one target.
+
+    Submissions are scheduled on a common clock, one every 60/rate seconds.
+    The rate starts at a quarter of ceiling_rpm and grows by
+    RATE_INCREASE_RPM after every quick success. It is cut multiplicatively
+    after slow responses, errors or HTTP 429/5xx answers, and always stays
+    between RATE_MIN_RPM and ceiling_rpm.
+    """
+    
+    def __init__(self, ceiling_rpm, start_rpm=None):
+        self.ceiling_rpm = max(RATE_MIN_RPM, ceiling_rpm)
+        self.rate = max(RATE_MIN_RPM, min(self.ceiling_rpm, start_rpm or self.ceiling_rpm / 4))
+        self.slowdowns = 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self, control=None):
+        """Block until the caller's submission slot; return the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 60 / self.rate
+        delay = slot - now
+        if delay > 0:
+            pause(delay, control)
+        return delay
+    
+    def record(self, ok, latency=None, statuses=()):
+        """Feed back one submission outcome; return why the rate was cut, or None"""
+        throttled = [status for status in statuses if status == 0 or status == 429 or status >= 500]
+        with self._lock:
+            if not ok or throttled:
+                reason = f"HTTP {throttled[0]}" if throttled else "submission failed"
+                self.rate = max(RATE_MIN_RPM, self.rate * RATE_BACKOFF_FACTOR)
+            elif latency is not None and latency > RATE_SLOW_SECONDS:
+                reason = f"slow response ({latency:.1f}s)"
+                self.rate = max(RATE_MIN_RPM, self.rate * RATE_SLOW_FACTOR)
+            else:
+                self.rate = min(self.ceiling_rpm, self.rate + RATE_INCREASE_RPM)
+                return None
+            
+            # Push the schedule back so the slower rate applies to the very next slot
+            self._next_slot = max(self._next_slot, time.monotonic() + 60 / self.rate)
+            self.slowdowns += 1
+            return reason
+
+# Retry queue for transient failures
+RETRY_MAX_ATTEMPTS = int(os.environ.get('RETRY_MAX_ATTEMPTS', 3))
+RETRY_BASE_DELAY = 5  # Seconds before the first retry round, doubled every round
+
+# Exceptions that trying again cannot fix: bad arguments and bugs in our own code
+PERMANENT_ERRORS = (InvalidArgumentException, ValueError, TypeError, KeyError, AttributeError)
+
+def classify_error(email, error=None):
+    """Label a failed submission 'transient' (worth retrying) or 'permanent'.
+
+    Invalid addresses and PERMANENT_ERRORS cannot be fixed by trying again.
+    Everything else is transient: browser errors (timeouts, stale elements,
+    navigation failures), timeouts and dropped connections on driver round
+    trips when Chrome hangs, and missing fields or server rejections without
+    an exception. automate_maven_signup turns them permanent once
+    RETRY_MAX_ATTEMPTS is used up.
+    """
+    if not re.fullmatch(EMAIL_ADDRESS_PATTERN, email):
+        return 'permanent'
+    return 'permanent' if isinstance(error, PERMANENT_ERRORS) else 'transient'
+
+def _process_emails(driver, waiter, resolver, emails, delay_between_emails, log, on_result=None, control=None, timer=None,
+                    rate=None):
+    """Submit each email through the signup form of the page already loaded in driver.
+
+    Each email is a single call to the in-page submit agent, whose outcome
+    includes the confirmation text the page showed, if any. on_result, if
+    given, is called with each result dict as soon as the email's outcome
+    is known. control (a JobControl) can pause or cancel the loop between
+    emails. timer (a PhaseTimer) records how long each phase of each email
+    took. rate (a RateController), if given, replaces the fixed
+    delay_between_emails pacing.
+    """
+    results = []
+    timer = timer or PhaseTimer()
+    driver.set_script_timeout(submit_agent_timeout(resolver))
+    
+    for i, email in enumerate(emails):
+        if control and not control.checkpoint():
+            log(f"🛑 Cancelled before {email}; {len(emails) - i} emails left pending")
+            break
+        
+        if rate:
+            with timer.phase('pacing', email):
+                rate.wait(control)
+        
+        log(f"📧 Processing email {i+1}/{len(emails)}: {email}")
+        waiter.take_timings()
+        recorded = len(results)
+        
+        try:
+            # One round trip: the in-page agent finds the form, submits and waits for the page's answer
+            log(f"🤖 Submitting {email} with the in-page agent...")
+            with timer.phase('submit', email) as started:
+                outcome = run_submit_agent(driver, resolver, email, log)
+            timer.sub_phases('submit', email, started, agent_phases(outcome))
+            result = agent_result(email, outcome, log)
+            results.append(result)
+            
+            if result['status'] == 'success':
+                log(f"✅ Form submitted successfully for: {email} ({result['message']})")
+            else:
+                log(f"❌ ERROR: {result['message']} for: {email}")
+            
+            if outcome.get('input') is None:
+                # Debug: Print page source snippet
+                page_source_snippet = driver.page_source[:1000]
+                log(f"📄 Page source snippet: {page_source_snippet}...")
+            
+            if 'settled' in outcome:
+                # The form was submitted - get it ready again, reloading only if needed
+                with timer.phase('reset', email):
+                    result['reset_strategy'] = reset_form(driver, waiter, resolver, log)
+                log("✅ Form is ready for next email")
+                
+                result['step_timings'] = {**result.get('step_timings', {}), **waiter.take_timings()}
+                log(f"⏱️ Step timings: {result['step_timings']}")
+            
+        except Exception as e:
+            error_msg = f"Error processing {email}: {str(e)}"
+            log(f"❌ {error_msg}")
+            log(f"📋 Full error trace: {traceback.format_exc()}")
+            
+            if len(results) > recorded:
+                # The form was already submitted, only resetting it failed
+                results[-1]['step_timings'] = {**results[-1].get('step_timings', {}), **waiter.take_timings()}
+                log(f"⚠️ WARNING: {email} was submitted but the form could not be reset")
+            else:
+                results.append({
+                    'email': email,
+                    'status': 'error',
+                    'timestamp': datetime.now().isoformat(),
+                    'message': str(e),
+                    'error_kind': classify_error(email, e),
+                    'step_timings': waiter.take_timings()
+                })
+        
+        finally:
+            for result in results[recorded:]:
+                if rate:
+                    # Let the outcome and the server's answer steer the adaptive pacing
+                    reason = rate.record(result['status'] == 'success', result.get('step_timings', {}).get('network_idle'),
+                                         result.get('http_statuses', ()))
+                    if reason:
+                        log(f"🐢 Slowing down to {rate.rate:.1f} submissions/min: {reason}")
+                if on_result:
+                    on_result(result)
+        
+        # Wait between submissions
+        if not rate and i < len(emails) - 1:
+            log(f"⏳ Waiting {delay_between_emails} seconds before next email...")
+            with timer.phase('pacing', email):
+                pause(delay_between_emails, control)
+    
+    return results
+
+JOB_STORE_PATH = os.path.join(DATA_DIR, "jobs.sqlite3")
+
+def make_job_id(maven_url, emails):
+    """Stable job id for a target URL and email list, so re-running the same job resumes it"""
+    digest = hashlib.sha256()
+    digest.update(maven_url.encode('utf-8'))
+    for email in sorted(set(emails)):
+        digest.update(b"\n" + email.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+class JobStore:
+    """Durable per-email outcomes in a local SQLite database.
+
+    Each result is written as soon as it is known, so a crash or restart
+    only loses the email that was in flight. The latest outcome per
+    (job, email) wins.
+    """
+    
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    maven_url TEXT NOT NULL,
+                    email_count INTEGER NOT NULL,
+                    created TEXT NOT NULL,
+                    updated TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_results (
+                    job_id TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    PRIMARY KEY (job_id, email)
+                )
+            """)
+    
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+    
+    def open_job(self, maven_url, emails):
+        """Register a job (or find the existing one) and return its id"""
+        job_id = make_job_id(maven_url, emails)
+        now = datetime.now().isoformat()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_id, maven_url, email_count, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (job_id, maven_url, len(emails), now, now)
+            )
+        return job_id
+    
+    def reset_job(self, job_id):
+        """Forget every recorded outcome of a job"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+    
+    def record(self, job_id, result):
+        """Store one email's result dict"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, email, status, record) VALUES (?, ?, ?, ?)",
+                (job_id, result['email'], result['status'], json.dumps(result))
+            )
+            conn.execute("UPDATE jobs SET updated = ? WHERE job_id = ?", (datetime.now().isoformat(), job_id))
+    
+    def successful_emails(self, job_id):
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT email FROM job_results WHERE job_id = ? AND status = 'success'", (job_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def results(self, job_id):
+        """Return the recorded result dicts of a job keyed by email"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT email, record FROM job_results WHERE job_id = ?", (job_id,)).fetchall()
+        return {email: json.loads(record) for email, record in rows}
+
+def _run_signup_worker(worker_id, emails, maven_url, delay_between_emails, log_container=None, num_workers=1, on_result=None,
+                       control=None, timeline=None, run_started=None, rate=None, lean_browser=False):
+    """Run one browser session over a shard of emails and return its result dicts"""
+    tag = f"[W{worker_id}] " if num_workers > 1 else ""
+    
+    def log(message):
+        debug_log(f"{tag}{message}", log_container)
+    
+    def record(result):
+        results.append(result)
+        if on_result:
+            on_result(result)
+    
+    manager = get_session_manager()
+    timer = PhaseTimer(timeline, run_started, worker_id)
+    session = None
+    healthy = True
+    results = []
+    
+    try:
+        # Borrow a warm browser (or launch one) from the session manager
+        with timer.phase('driver_init'):
+            session = manager.acquire(log_container, lean=lean_browser)
+        driver = session.driver
+        
+        # Navigate to Maven website
+        log(f"🌐 Navigating to Maven website: {maven_url}")
+        with timer.phase('navigation'):
+            driver.get(maven_url)
+            
+            # Wait for the page to load
+            log("⏳ Waiting for page to load...")
+            waiter = ReadinessWaiter(driver)
+            if not waiter.document_ready():
+                log("⚠️ WARNING: Page did not finish loading within the timeout budget")
+        log(f"⏱️ Page load wait: {waiter.take_timings()['page_load']:.2f}s")
+        
+        current_url = driver.current_url
+        page_title = driver.title
+        log(f"✓ Page loaded successfully!")
+        log(f"📄 Current URL: {current_url}")
+        log(f"📝 Page title: {page_title}")
+        
+        # Check if page loaded correctly
+        if urlsplit(maven_url).netloc.lower() not in current_url.lower():
+            log("⚠️ WARNING: Might have been redirected away from the target page")
+        
+        resolver = SelectorResolver(maven_url)
+        if resolver.entry:
+            log(f"♻️ Using cached selectors for this page: {resolver.entry}")
+        
+        _process_emails(driver, waiter, resolver, emails, delay_between_emails, log, on_result=record, control=control, timer=timer,
+                        rate=rate)
+        return results
+        
+    except Exception as e:
+        healthy = False
+        error_msg = f"Critical error occurred: {str(e)}"
+        log(f"💥 {error_msg}")
+        log(f"📋 Full error trace: {traceback.format_exc()}")
+        
+        # Mark every email of this shard that has no outcome yet
+        processed = {r['email'] for r in results}
+        for email in emails:
+            if email not in processed:
+                record({
+                    'email': email,
+                    'status': 'error',
+                    'timestamp': datetime.now().isoformat(),
+                    'message': f"Critical automation error: {str(e)}",
+                    'error_kind': classify_error(email)
+                })
+        
+        return results
+        
+    finally:
+        if session:
+            manager.release(session, log_container, healthy=healthy)
+
+def run_signup_pool(emails, maven_url, delay_between_emails=2, log_container=None, num_workers=1, on_result=None, control=None,
+                    timeline=None, rate=None, lean_browser=False):
+    """Shard emails across num_workers independent Chrome sessions.
+
+    Emails are dealt round-robin so every worker gets a similar load. The
+    per-email result dicts are merged back in the original email order.
+    Phase timings of every worker are appended to timeline, if given, and
+    all workers share the rate controller, if given.
+    """
+    run_started = time.perf_counter()
+    shards = deal_round_robin(emails, num_workers)
+    num_workers = len(shards)
+    debug_log(f"👷 Starting {num_workers} browser worker(s)", log_container)
+    
+    def run_shard(worker_id, shard):
+        return _run_signup_worker(worker_id, shard, maven_url, delay_between_emails, log_container, num_workers, on_result,
+                                  control, timeline, run_started, rate, lean_browser)
+    
+    shard_results = run_in_threads(run_shard, list(enumerate(shards, 1)), "signup-worker")
+    
+    # Interleave shard results back into the original email order
+    results = []
+    for position in range(len(emails)):
+        shard = shard_results[position % num_workers]
+        offset = position // num_workers
+        if offset < len(shard):
+            results.append(shard[offset])
+    return results
+
+# Multi-context CDP engine: many isolated browser contexts inside one headless Chrome
+CDP_CONTEXTS = int(os.environ.get('CDP_CONTEXTS', 8))
+CDP_CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+CDP_POLL_SECONDS = 0.05
+
+class CdpError(Exception):
+    """A DevTools Protocol command failed"""
+
+def find_chrome_binary():
+    """Chrome executable for the CDP engine: CHROME_BIN, then the usual names on PATH"""
+    candidates = [os.environ.get('CHROME_BIN')] + [shutil.which(name) for name in CDP_CHROME_BINARIES]
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+class CdpConnection:
+    """Minimal asyncio DevTools Protocol client: one browser websocket, flattened target sessions"""
+    
+    def __init__(self, ws):
+        self._ws = ws
+        self._next_id = 0
+        self._pending = {}
+        self._reader = asyncio.ensure_future(self._read())
+    
+    @classmethod
+    async def connect(cls, url):
+        return cls(await websockets.connect(url, max_size=None))
+    
+    async def _read(self):
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                future = self._pending.pop(message.get('id'), None)
+                if future is None or future.done():
+                    continue  # Events are not used; everything is polled
+                if 'error' in message:
+                    future.set_exception(CdpError(message['error'].get('message', str(message['error']))))
+                else:
+                    future.set_result(message.get('result', {}))
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("DevTools connection closed"))
+    
+    async def send(self, method, params=None, session_id=None, timeout=30):
+        self._next_id += 1
+        message = {'id': self._next_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._next_id] = future
+        await self._ws.send(json.dumps(message))
+        return await asyncio.wait_for(future, timeout)
+    
+    async def close(self):
+        await self._ws.close()
+        self._reader.cancel()
+
+class CdpContext:
+    """One isolated browser context (own cookies and storage) holding a single page"""
+    
+    def __init__(self, conn, context_id, session_id, lean=False):
+        self.conn = conn
+        self.context_id = context_id
+        self.session_id = session_id
+        self.lean = lean
+    
+    @classmethod
+    async def create(cls, conn, lean=False):
+        context_id = (await conn.send('Target.createBrowserContext', {'disposeOnDetach': True}))['browserContextId']
+        target_id = (await conn.send('Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id}))['targetId']
+        session_id = (await conn.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True}))['sessionId']
+        context = cls(conn, context_id, session_id, lean)
+        if lean:
+            await context.send('Network.enable')
+            await context.send('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        return context
+    
+    async def send(self, method, params=None, timeout=30):
+        return await self.conn.send(method, params, self.session_id, timeout)
+    
+    async def run_script(self, body, *args, timeout=30):
+        """Run a WebDriver-style script body (using arguments[] and return) and return its value"""
+        expression = f"(async function () {{{body}\n}}).apply(null, {json.dumps(list(args))})"
+        result = await self.send('Runtime.evaluate', {'expression': expression, 'awaitPromise': True, 'returnByValue': True},
+                                 timeout=timeout)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CdpError(details.get('exception', {}).get('description') or details.get('text', 'Script failed'))
+        return result['result'].get('value')
+    
+    async def load(self, url=None):
+        """Navigate to url (or reload) and wait for the new document, then install the network tracker"""
+        await self.run_script("window.__mavenStale = true;")
+        if url:
+            await self.send('Page.navigate', {'url': url})
+        else:
+            await self.send('Page.reload')
+        
+        ready_states = ('interactive', 'complete') if self.lean else ('complete',)
+        deadline = time.monotonic() + READINESS_TIMEOUTS['page_load']
+        while time.monotonic() < deadline:
+            try:
+                state = await self.run_script("return window.__mavenStale ? null : document.readyState;")
+            except CdpError:
+                state = None  # The old document went away mid-call
+            if state in ready_states:
+                break
+            await asyncio.sleep(CDP_POLL_SECONDS)
+        await self.run_script(NETWORK_TRACKER_JS)
+    
+    async def url(self):
+        return await self.run_script("return location.href;")
+    
+    async def landed_page(self):
+        """Text of the page a form post navigated to, or None if it never loaded"""
+        deadline = time.monotonic() + READINESS_TIMEOUTS['page_load']
+        while time.monotonic() < deadline:
+            try:
+                text = await self.run_script(LANDED_PAGE_JS)
+            except CdpError:
+                text = None  # Still between documents
+            if text is not None:
+                return text
+            await asyncio.sleep(CDP_POLL_SECONDS)
+        return None
+    
+    async def close(self):
+        try:
+            await self.conn.send('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+        except Exception:
+            pass
+
+async def _cdp_submit(context, resolver, email, log):
+    """Submit one email in a CDP context with the shared in-page agent.
+
+    Returns (result dict, the agent's outcome). As in _process_emails, the
+    form needs a reset when the outcome has 'settled'.
+    """
+    args = submit_agent_arguments(resolver, email)
+    try:
+        outcome = await context.run_script(SUBMIT_AGENT_JS, *args, timeout=submit_agent_timeout(resolver))
+    except CdpError as e:
+        if 'navigated' not in str(e) and 'destroyed' not in str(e):
+            raise
+        # A classic form post replaced the page, so the answer is on the new one
+        outcome = landed_page_outcome(await context.landed_page())
+    
+    remember_agent_selectors(resolver, args, outcome, log)
+    result = agent_result(email, outcome, log)
+    result['engine'] = 'cdp'
+    return result, outcome
+
+async def _cdp_reset(context, resolver, log):
+    """CDP counterpart of reset_form: in place, re-navigate or reload"""
+    if _selector_cache_key(await context.url()) == resolver.key:
+        if await context.run_script(RESET_FORM_IN_PLACE_JS, resolver.input_selector, resolver.entry.get('button')):
+            return 'in_place'
+        await context.load()
+        return 'refresh'
+    log("🔄 Submission navigated away, going back to the target page...")
+    await context.load(resolver.url)
+    return 're-navigate'
+
+async def _run_cdp_contexts(emails, maven_url, delay_between_emails, log_container, num_contexts, on_result, control,
+                            timeline, rate, lean_browser):
+    chrome_binary = find_chrome_binary()
+    if chrome_binary is None:
+        raise Exception("No Chrome binary found for the CDP engine (set CHROME_BIN)")
+    
+    os.makedirs(CHROME_USER_DATA_ROOT, exist_ok=True)
+    profile_dir = tempfile.mkdtemp(prefix="cdp-", dir=CHROME_USER_DATA_ROOT)
+    port = _find_free_port()
+    args = [chrome_binary, '--headless=new', '--no-sandbox', '--disable-gpu', '--disable-dev-shm-usage',
+            '--disable-extensions', '--no-first-run', '--no-default-browser-check', '--mute-audio',
+            f'--remote-debugging-port={port}', f'--user-data-dir={profile_dir}', 'about:blank']
+    if lean_browser:
+        args.insert(1, '--blink-settings=imagesEnabled=false')
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    debug_log(f"🧩 Started one Chrome (pid {process.pid}) for {num_contexts} CDP contexts", log_container)
+    
+    loop = asyncio.get_running_loop()
+    run_started = time.perf_counter()
+    work = deque(emails)
+    results = {}
+    conn = None
+    
+    async def context_worker(n):
+        timer = PhaseTimer(timeline, run_started, f"ctx-{n}")
+        
+        def log(message):
+            debug_log(f"[C{n}] {message}", log_container)
+        
+        with timer.phase('driver_init'):
+            context = await CdpContext.create(conn, lean_browser)
+        try:
+            resolver = SelectorResolver(maven_url)
+            with timer.phase('navigation'):
+                await context.load(maven_url)
+            
+            while work:
+                if control and not await loop.run_in_executor(None, control.checkpoint):
+                    return
+                if not work:
+                    break  # Another context took the last email while this one was paused
+                email = work.popleft()
+                if rate:
+                    with timer.phase('pacing', email):
+                        await loop.run_in_executor(None, rate.wait, control)
+                
+                log(f"📧 Processing {email}")
+                result = None
+                reload = False
+                try:
+                    with timer.phase('submit', email) as started:
+                        result, outcome = await _cdp_submit(context, resolver, email, log)
+                    timer.sub_phases('submit', email, started, agent_phases(outcome))
+                    if 'settled' in outcome:
+                        with timer.phase('reset', email):
+                            result['reset_strategy'] = await _cdp_reset(context, resolver, log)
+                except Exception as e:
+                    log(f"❌ Error processing {email}: {str(e)}")
+                    reload = True
+                    if result is not None:
+                        # The form was already submitted, only resetting it failed
+                        log(f"⚠️ WARNING: {email} was submitted but the form could not be reset")
+                    else:
+                        result = {
+                            'email': email,
+                            'status': 'error',
+                            'timestamp': datetime.now().isoformat(),
+                            'message': str(e),
+                            'error_kind': classify_error(email, e),
+                            'engine': 'cdp'
+                        }
+                
+                log(f"{'✅' if result['status'] == 'success' else '❌'} {email}: {result['message']}")
+                results[email] = result
+                if rate:
+                    rate.record(result['status'] == 'success', result.get('step_timings', {}).get('network_idle'),
+                                result.get('http_statuses', ()))
+                if on_result:
+                    on_result(result)
+                
+                if reload:
+                    with timer.phase('reset', email):
+                        try:
+                            await context.load(maven_url)
+                        except Exception as e:
+                            log(f"⚠️ Reload failed ({str(e)}); starting a fresh context...")
+                            await context.close()
+                            context = await CdpContext.create(conn, lean_browser)
+                            await context.load(maven_url)
+                
+                if not rate and work:
+                    with timer.phase('pacing', email):
+                        await asyncio.sleep(delay_between_emails)
+        finally:
+            await context.close()
+    
+    try:
+        # Wait for the DevTools endpoint to come up
+        deadline = time.monotonic() + READINESS_TIMEOUTS['page_load']
+        while True:
+            try:
+                version = await loop.run_in_executor(None, lambda: requests.get(f"http://127.0.0.1:{port}/json/version", timeout=1).json())
+                break
+            except (requests.RequestException, ValueError):
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise Exception("Chrome did not expose a DevTools endpoint")
+                await asyncio.sleep(0.1)
+        
+        conn = await CdpConnection.connect(version['webSocketDebuggerUrl'])
+        outcomes = await asyncio.gather(*(context_worker(n + 1) for n in range(num_contexts)), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                debug_log(f"💥 CDP context failed: {str(outcome)}", log_container)
+        
+    finally:
+        if conn:
+            await conn.close()
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    
+    return results
+
+def run_cdp_pool(emails, maven_url, delay_between_emails=2, log_container=None, num_contexts=CDP_CONTEXTS, on_result=None,
+                 control=None, timeline=None, rate=None, lean_browser=False):
+    """Drive num_contexts isolated browser contexts of one headless Chrome from a single event loop.
+
+    Contexts pull emails from a shared queue, so a slow context never holds
+    up the rest. Result dicts match the Selenium path and come back in the
+    original email order. Emails that never got a result (a context failed
+    to start, or Chrome could not be launched) are reported as transient
+    errors.
+    """
+    if websockets is None:
+        raise Exception("The CDP engine needs the 'websockets' package")
+    num_contexts = max(1, min(int(num_contexts), len(emails)))
+    
+    try:
+        results = asyncio.run(_run_cdp_contexts(emails, maven_url, delay_between_emails, log_container, num_contexts,
+                                                on_result, control, timeline, rate, lean_browser))
+    except Exception as e:
+        debug_log(f"💥 CDP engine failed: {str(e)}", log_container)
+        debug_log(f"📋 Full error trace: {traceback.format_exc()}", log_container)
+        results = {}
+        error = str(e)
+    else:
+        error = "No CDP context picked up this email"
+    
+    if not (control and control.cancelled):
+        for email in emails:
+            if email not in results:
+                results[email] = {
+                    'email': email,
+                    'status': 'error',
+                    'timestamp': datetime.now().isoformat(),
+                    'message': f"Critical automation error: {error}",
+                    'error_kind': classify_error(email),
+                    'engine': 'cdp'
+                }
+                if on_result:
+                    on_result(results[email])
+    return [results[email] for email in emails if email in results]
+
+# HTTP replay of a captured form submission
+REPLAY_PLACEHOLDER = "__MAVEN_EMAIL__"
+REPLAY_SKIP_HEADERS = {'content-length', 'host', 'connection', 'accept-encoding', 'cookie'}
+HTTP_REPLAY_TIMEOUT = 15
+HTTP_REPLAY_MAX_FAILURES = 3  # Failures in a row before replay is abandoned for the run
+
+# How an address can appear in a captured request, most literal first
+REPLAY_ENCODINGS = {
+    'raw': lambda email: email,
+    'urlencoded': quote_plus,
+}
+
+# Only these can carry a signup; sendBeacon pings and tracking endpoints never do
+REPLAY_METHODS = {'POST', 'PUT', 'PATCH'}
+REPLAY_IGNORED_URL_PATTERN = (
+    r"google-analytics|googletagmanager|doubleclick|facebook\.(com|net)/tr|segment\.(io|com)|mixpanel|amplitude|"
+    r"hotjar|heapanalytics|posthog|sentry|clarity\.ms|intercom|/(collect|track|identify|analytics|beacon|telemetry|metrics)\b"
+)
+
+def _json_shape(value):
+    """Keys and value types of a JSON document; booleans and nulls keep their value"""
+    if isinstance(value, dict):
+        return {key: _json_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_shape(value[0])] if value else []
+    if isinstance(value, bool) or value is None:
+        return value
+    return type(value).__name__
+
+def response_signature(status, body, email):
+    """What a submission's response says, leaving out what varies per address.
+
+    Keeps the status, the shape of a JSON body and whether the body reads as
+    a confirmation or an error. A body of None (not captured) keeps only the
+    status.
+    """
+    signature = {'status': status}
+    if body is None:
+        return signature
+    for encode in REPLAY_ENCODINGS.values():
+        body = body.replace(encode(email), REPLAY_PLACEHOLDER)
+    try:
+        signature['json'] = _json_shape(json.loads(body))
+    except ValueError:
+        signature['json'] = None
+    signature['confirmed'] = bool(re.search(CONFIRMATION_PATTERN, body, re.I))
+    signature['error'] = bool(re.search(PAGE_ERROR_PATTERN, body, re.I))
+    return signature
+
+def _response_body(driver, request_id):
+    """Text body the browser received for a logged request, or None"""
+    try:
+        response = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    except Exception:
+        return None
+    return None if response.get('base64Encoded') else response.get('body')
+
+def capture_submission(driver, email, clicked_at=None):
+    """Turn the signup request that carried email into a replay template, using the performance log.
+
+    Only a POST/PUT/PATCH to an endpoint that isn't a tracker, sent at or
+    after clicked_at (epoch seconds), counts. Returns a dict with method,
+    url, headers, body, the encoding the address had (all with the address
+    replaced by REPLAY_PLACEHOLDER) and the signature of the response the
+    browser got; or None if no logged request qualifies.
+    """
+    messages = [json.loads(entry['message'])['message'] for entry in driver.get_log('performance')]
+    statuses = {message['params']['requestId']: message['params']['response']['status']
+                for message in messages if message.get('method') == 'Network.responseReceived'}
+    
+    for message in messages:
+        if message.get('method') != 'Network.requestWillBeSent':
+            continue
+        params = message['params']
+        request = params['request']
+        if (request['method'] not in REPLAY_METHODS or params.get('type') == 'Ping'
+                or re.search(REPLAY_IGNORED_URL_PATTERN, request['url'], re.I)
+                or (clicked_at is not None and params.get('wallTime', clicked_at) < clicked_at)):
+            continue
+        
+        body = request.get('postData')
+        if body is None and request.get('hasPostData'):
+            try:
+                body = driver.execute_cdp_cmd('Network.getRequestPostData', {'requestId': params['requestId']})['postData']
+            except Exception:
+                body = None
+        
+        for encoding, encode in REPLAY_ENCODINGS.items():
+            encoded = encode(email)
+            if encoded in (body or '') or encoded in request['url']:
+                return {
+                    'method': request['method'],
+                    'url': request['url'].replace(encoded, REPLAY_PLACEHOLDER),
+                    'headers': {name: value for name, value in request.get('headers', {}).items()
+                                if not name.startswith(':') and name.lower() not in REPLAY_SKIP_HEADERS},
+                    'body': body.replace(encoded, REPLAY_PLACEHOLDER) if body else None,
+                    'encoding': encoding,
+                    'response': response_signature(statuses.get(params['requestId']),
+                                                   _response_body(driver, params['requestId']), email)
+                }
+    return None
+
+class HttpReplayer:
+    """Replays a captured submission template for other addresses.
+
+    Each thread gets its own keep-alive requests.Session seeded with the
+    captured headers and the browser's cookies, so connections are reused
+    across emails without sharing a session between threads.
+    """
+    
+    def __init__(self, template, cookies=(), timeout=HTTP_REPLAY_TIMEOUT):
+        self.template = template
+        self.cookies = list(cookies)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+    
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(self.template['headers'])
+            for cookie in self.cookies:
+                session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+    
+    def submit(self, email):
+        """Send the submission for one address; returns (HTTP status, whether the response matches the browser's)"""
+        encoded = REPLAY_ENCODINGS[self.template['encoding']](email)
+        body = self.template['body']
+        response = self._session().request(
+            self.template['method'],
+            self.template['url'].replace(REPLAY_PLACEHOLDER, encoded),
+            data=body.replace(REPLAY_PLACEHOLDER, encoded).encode('utf-8') if body else None,
+            timeout=self.timeout
+        )
+        expected = self.template['response']
+        body = response.text if 'json' in expected else None
+        return response.status_code, response_signature(response.status_code, body, email) == expected
+    
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+def calibrate_http_replay(maven_url, email, log_container=None, on_result=None, timeline=None, lean_browser=False):
+    """Submit one email in a capturing browser and build a replayer from the request it sent.
+
+    Returns (results, replayer); replayer is None when the submission could
+    not be captured or the browser did not get a 2xx answer to it. The
+    browser is closed afterwards.
+    """
+    manager = get_session_manager()
+    timer = PhaseTimer(timeline, worker='calibration')
+    session = None
+    healthy = True
+    results = []
+    
+    def log(message):
+        debug_log(f"[HTTP] {message}", log_container)
+    
+    try:
+        log("🎯 Calibrating HTTP mode: capturing one browser submission...")
+        with timer.phase('driver_init'):
+            session = manager.acquire(log_container, capture_network=True, lean=lean_browser)
+        driver = session.driver
+        
+        with timer.phase('navigation'):
+            driver.get(maven_url)
+            waiter = ReadinessWaiter(driver)
+            waiter.document_ready()
+        driver.get_log('performance')  # Drop the page load entries
+        
+        # Submit directly rather than through _process_emails: the click time bounds the capture
+        resolver = SelectorResolver(maven_url)
+        driver.set_script_timeout(submit_agent_timeout(resolver))
+        started = time.time()
+        with timer.phase('submit', email) as started_at:
+            outcome = run_submit_agent(driver, resolver, email, log)
+        timer.sub_phases('submit', email, started_at, agent_phases(outcome))
+        results = [agent_result(email, outcome, log)]
+        if on_result:
+            on_result(results[0])
+        if results[0]['status'] != 'success':
+            log("⚠️ Calibration submission failed; HTTP mode is off for this run")
+            return results, None
+        
+        template = capture_submission(driver, email, outcome['clicked'] / 1000 if outcome.get('clicked') else started)
+        if template is None:
+            log("⚠️ No signup request carried the email; HTTP mode is off for this run")
+            return results, None
+        status = template['response']['status']
+        if not status or not 200 <= status < 300:
+            log(f"⚠️ The captured {template['method']} {template['url']} was answered with HTTP {status}; HTTP mode is off for this run")
+            return results, None
+        
+        log(f"✅ Captured submission: {template['method']} {template['url']} ({template['encoding']} body)")
+        return results, HttpReplayer(template, driver.get_cookies())
+        
+    except Exception as e:
+        healthy = False
+        log(f"❌ Calibration failed: {str(e)}")
+        log(f"📋 Full error trace: {traceback.format_exc()}")
+        return results, None
+        
+    finally:
+        if session:
+            manager.release(session, log_container, healthy=healthy)
+
+def run_http_replay(emails, replayer, delay_between_emails=2, log_container=None, num_workers=1, on_result=None, control=None,
+                    timeline=None, rate=None):
+    """Submit emails through the replayer; return the emails that need the browser instead.
+
+    The first email is replayed alone as a probe: unless its response
+    matches the one the browser got, replay is abandoned before any other
+    email is sent. The rest are sharded over num_workers threads like
+    run_signup_pool. A replay only counts when its response matches; an
+    email whose replay fails falls back to the browser, and after
+    HTTP_REPLAY_MAX_FAILURES failures in a row replay is abandoned and the
+    rest of the run goes to the browser too.
+    """
+    run_started = time.perf_counter()
+    fallback = set()
+    failures_in_row = 0
+    abandoned = threading.Event()
+    lock = threading.Lock()
+    
+    def replay_one(email, timer):
+        """Replay one email and report its result; returns whether it went through"""
+        nonlocal failures_in_row
+        if rate:
+            with timer.phase('pacing', email):
+                rate.wait(control)
+        
+        started = time.perf_counter()
+        try:
+            with timer.phase('http_submit', email):
+                status, matches = replayer.submit(email)
+            if matches:
+                error = None
+            elif 200 <= status < 300:
+                error = f"HTTP {status} response differs from the browser run"
+            else:
+                error = f"HTTP {status}"
+        except requests.RequestException as e:
+            status, error = 0, str(e)
+        
+        if rate:
+            rate.record(error is None, time.perf_counter() - started, [status])
+        
+        if error is None:
+            with lock:
+                failures_in_row = 0
+            debug_log(f"⚡ Replayed submission for {email} (HTTP {status})", log_container)
+            if on_result:
+                on_result({
+                    'email': email,
+                    'status': 'success',
+                    'timestamp': datetime.now().isoformat(),
+                    'message': 'Submitted via HTTP replay',
+                    'mode': 'http',
+                    'http_statuses': [status]
+                })
+            return True
+        
+        debug_log(f"⚠️ HTTP replay failed for {email} ({error}); it will go through the browser", log_container)
+        with lock:
+            fallback.add(email)
+            failures_in_row += 1
+            if failures_in_row >= HTTP_REPLAY_MAX_FAILURES and not abandoned.is_set():
+                abandoned.set()
+                debug_log(f"🔙 {failures_in_row} replays failed in a row; using the browser for the rest of the run", log_container)
+        return False
+    
+    def pace(timer, email):
+        if not rate:
+            with timer.phase('pacing', email):
+                pause(delay_between_emails, control)
+    
+    # Probe: one replay must answer like the browser did before the rest are sent
+    if control and not control.checkpoint():
+        return []
+    probe_timer = PhaseTimer(timeline, run_started, "http-1")
+    if not replay_one(emails[0], probe_timer):
+        debug_log("🔙 Replayed response did not match the browser run; using the browser for this run", log_container)
+        return list(emails)
+    rest = emails[1:]
+    if not rest:
+        return []
+    pace(probe_timer, emails[0])
+    
+    def replay_shard(worker_id, shard):
+        timer = PhaseTimer(timeline, run_started, f"http-{worker_id}")
+        
+        for i, email in enumerate(shard):
+            if abandoned.is_set():
+                with lock:
+                    fallback.update(shard[i:])
+                return
+            if control and not control.checkpoint():
+                return
+            
+            replay_one(email, timer)
+            if i < len(shard) - 1:
+                pace(timer, email)
+    
+    run_in_threads(replay_shard, list(enumerate(deal_round_robin(rest, num_workers), 1)), "http-replay")
+    
+    return [email for email in emails if email in fallback]
+
+def automate_maven_signup(emails, maven_url, delay_between_emails=2, log_container=None, num_workers=1, resume=True,
+                          job_store=None, control=None, on_result=None, timeline=None, rate_limit=None, http_mode=False,
+                          lean_browser=False, engine='selenium'):
+    """Automate Maven signup process with enhanced debugging.
+
+    Every outcome is checkpointed to the job store. With resume=True, emails
+    that already succeeded in an earlier run of the same job are skipped.
+    Transient failures are retried at the end of the run in rounds with
+    exponential backoff, up to RETRY_MAX_ATTEMPTS per email. With
+    rate_limit (submissions per minute), pacing adapts to the server's
+    responses up to that ceiling instead of using delay_between_emails.
+    With http_mode, the first email is submitted in a capturing browser and
+    the rest replay that request over HTTP, falling back to the browser for
+    any email whose replay fails. lean_browser runs every browser with the
+    lean resource-blocking profile. engine='cdp' runs the browser work as
+    num_workers contexts inside one Chrome instead of one Chrome per worker.
+    """
+    
+    debug_log(f"🚀 STARTING MAVEN AUTOMATION", log_container)
+    debug_log(f"📧 Number of emails to process: {len(emails)}", log_container)
+    if rate_limit:
+        debug_log(f"🎚️ Adaptive pacing up to {rate_limit} submissions/min", log_container)
+    else:
+        debug_log(f"⏱️ Delay between emails: {delay_between_emails} seconds", log_container)
+    debug_log(f"📋 Email list: {emails[:3]}{'...' if len(emails) > 3 else ''}", log_container)
+    
+    if not emails:
+        debug_log("❌ ERROR: No emails provided to process!", log_container)
+        return []
+    
+    job_store = job_store or JobStore()
+    job_id = job_store.open_job(maven_url, emails)
+    debug_log(f"🗂️ Job ID: {job_id}", log_container)
+    
+    if resume:
+        already_done = job_store.successful_emails(job_id)
+        pending = [email for email in emails if email not in already_done]
+        if already_done:
+            debug_log(f"⏭️ Resuming job: skipping {len(emails) - len(pending)} already successful emails", log_container)
+    else:
+        job_store.reset_job(job_id)
+        pending = list(emails)
+    
+    attempts = {}
+    
+    def record(result):
+        result['target'] = maven_url
+        attempts[result['email']] = result['attempts'] = attempts.get(result['email'], 0) + 1
+        if result['status'] == 'error' and result.get('error_kind') == 'transient' and result['attempts'] >= RETRY_MAX_ATTEMPTS:
+            result['error_kind'] = 'permanent'
+            result['message'] += f" (gave up after {result['attempts']} attempts)"
+        job_store.record(job_id, result)
+        if on_result:
+            on_result(result)
+    
+    rate = RateController(rate_limit) if rate_limit else None
+    
+    def run_browsers(batch):
+        if engine == 'cdp':
+            return run_cdp_pool(batch, maven_url, delay_between_emails, log_container, num_workers, record, control,
+                                timeline, rate, lean_browser)
+        return run_signup_pool(batch, maven_url, delay_between_emails, log_container, num_workers,
+                               on_result=record, control=control, timeline=timeline, rate=rate, lean_browser=lean_browser)
+    
+    if pending:
+        browser_pending = pending
+        if http_mode:
+            calibrated, replayer = calibrate_http_replay(maven_url, pending[0], log_container, record, timeline, lean_browser)
+            browser_pending = pending[len(calibrated):]
+            if replayer and browser_pending:
+                try:
+                    browser_pending = run_http_replay(browser_pending, replayer, delay_between_emails, log_container, num_workers,
+                                                      on_result=record, control=control, timeline=timeline, rate=rate)
+                finally:
+                    replayer.close()
+        
+        if browser_pending and not (control and control.cancelled):
+            run_browsers(browser_pending)
+        
+        # Retry queue: transient failures get further rounds with exponential backoff
+        for attempt in range(2, RETRY_MAX_ATTEMPTS + 1):
+            if control and control.cancelled:
+                break
+            recorded = job_store.results(job_id)
+            retry = [email for email in pending
+                     if recorded.get(email, {}).get('status') == 'error' and recorded[email].get('error_kind') == 'transient']
+            if not retry:
+                break
+            
+            backoff = RETRY_BASE_DELAY * 2 ** (attempt - 2) * random.uniform(1, 1.5)
+            debug_log(f"🔁 Retrying {len(retry)} transient failures in {backoff:.0f}s (attempt {attempt}/{RETRY_MAX_ATTEMPTS})", log_container)
+            pause(backoff, control)
+            if control and not control.checkpoint():
+                break
+            run_browsers(retry)
+        
+        if rate:
+            debug_log(f"🎚️ Adaptive pacing ended at {rate.rate:.1f} submissions/min after {rate.slowdowns} slowdowns", log_container)
+    
+    recorded = job_store.results(job_id)
+    results = [recorded[email] for email in emails if email in recorded]
+    
+    if control and control.cancelled:
+        debug_log("🛑 Automation cancelled; unprocessed emails stay pending for the next run", log_container)
+    else:
+        debug_log("🎉 All emails processed successfully!", log_container)
+    debug_log(f"📊 Final results: {len(results)} total, {len([r for r in results if r['status'] == 'success'])} successful, {len([r for r in results if r['status'] == 'error'])} errors", log_container)
+    
+    return results
+
+def automate_targets(targets, delay_between_emails=2, log_container=None, num_workers=1, resume=True, job_store=None,
+                     control=None, on_result=None, timeline=None, rate_limit=None, http_mode=False, lean_browser=False,
+                     engine='selenium'):
+    """Run automate_maven_signup for several (maven_url, emails) targets at once.
+
+    Each target is its own job in the store, with its own browsers, page
+    state and cached selectors, so targets run concurrently without sharing
+    anything but the session manager. num_workers, rate_limit, http_mode,
+    lean_browser and engine apply per target.
+    Results come back grouped in target order; timeline events are tagged
+    with their target.
+    """
+    targets = [(maven_url, list(emails)) for maven_url, emails in targets if emails]
+    job_store = job_store or JobStore()
+    timelines = [[] for _ in targets]
+    
+    if len(targets) > 1:
+        debug_log(f"🎯 Fanning out over {len(targets)} targets", log_container)
+    
+    def run_target(index):
+        maven_url, emails = targets[index]
+        return automate_maven_signup(emails, maven_url, delay_between_emails, log_container, num_workers, resume,
+                                     job_store, control, on_result, timelines[index], rate_limit, http_mode, lean_browser,
+                                     engine)
+    
+    target_results = run_in_threads(run_target, [(index,) for index in range(len(targets))], "signup-target")
+    
+    if timeline is not None:
+        for (maven_url, _), events in zip(targets, timelines):
+            for event in events:
+                event['target'] = maven_url
+                timeline.append(event)
+    
+    return [result for results in target_results for result in results]
+
+# Distributed mode: email shards in a shared queue, claimed by worker nodes under a lease.
+# SHARD_QUEUE is a SQLite file on a volume every node mounts, or the URL of a queue server.
+SHARD_QUEUE = os.environ.get('SHARD_QUEUE', os.path.join(DATA_DIR, "queue.sqlite3"))
+SHARD_QUEUE_TOKEN = os.environ.get('SHARD_QUEUE_TOKEN') or None
+SHARD_QUEUE_PORT = 8600
+SHARD_SIZE = int(os.environ.get('SHARD_SIZE', 25))
+SHARD_LEASE_SECONDS = int(os.environ.get('SHARD_LEASE_SECONDS', 120))
+SHARD_MAX_ATTEMPTS = int(os.environ.get('SHARD_MAX_ATTEMPTS', 3))
+SHARD_POLL_SECONDS = 2
+
+# Queue operations a network backend forwards to the queue server
+SHARD_QUEUE_METHODS = ('enqueue', 'claim', 'renew', 'report', 'finish', 'release', 'cancel', 'progress', 'results_since',
+                       'results')
+
+class SqliteShardQueue(JobStore):
+    """Shard queue in a SQLite file, shared by every node that can open it.
+
+    SQLite's file lock makes each claim atomic: it first puts shards whose
+    lease expired back in the queue (or fails them after max_attempts),
+    then leases the oldest queued shard. progress() expires leases the same
+    way, so a job whose workers all died still ends. Per-email results
+    are kept in the JobStore tables of the same file.
+    """
+    
+    def __init__(self, path=SHARD_QUEUE, max_attempts=SHARD_MAX_ATTEMPTS):
+        super().__init__(path)
+        self.max_attempts = max_attempts
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    shard_id TEXT PRIMARY KEY,
+                    job_id TEXT NOT NULL,
+                    maven_url TEXT NOT NULL,
+                    emails TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    worker TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created TEXT NOT NULL,
+                    updated TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS shards_by_job ON shards (job_id, state)")
+    
+    def enqueue(self, maven_url, emails, options=None, shard_size=SHARD_SIZE, resume=True):
+        """Split a target's emails into shards and queue them; returns the job id.
+
+        Emails that already succeeded (with resume) or that sit in a shard
+        still queued or leased are not queued again.
+        """
+        job_id = self.open_job(maven_url, emails)
+        if not resume:
+            self.reset_job(job_id)
+        done = self.successful_emails(job_id)
+        now = datetime.now().isoformat()
+        
+        with closing(self._connect()) as conn, conn:
+            active = set()
+            for (shard_emails,) in conn.execute(
+                "SELECT emails FROM shards WHERE job_id = ? AND state IN ('queued', 'leased')", (job_id,)
+            ):
+                active.update(json.loads(shard_emails))
+            pending = [email for email in emails if email not in done and email not in active]
+            for start in range(0, len(pending), max(1, int(shard_size))):
+                conn.execute(
+                    "INSERT INTO shards (shard_id, job_id, maven_url, emails, options, state, created, updated) "
+                    "VALUES (?, ?, ?, ?, ?, 'queued', ?, ?)",
+                    (uuid.uuid4().hex[:12], job_id, maven_url, json.dumps(pending[start:start + shard_size]),
+                     json.dumps(options or {}), now, now)
+                )
+        return job_id
+    
+    def _expire_leases(self, conn):
+        """Requeue shards whose lease ran out, or fail them once they used up max_attempts"""
+        now = datetime.now().isoformat()
+        conn.execute(
+            "UPDATE shards SET state = 'failed', worker = NULL, error = 'Lease expired too often', updated = ? "
+            "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, time.time(), self.max_attempts)
+        )
+        conn.execute(
+            "UPDATE shards SET state = 'queued', worker = NULL, updated = ? WHERE state = 'leased' AND lease_expires < ?",
+            (now, time.time())
+        )
+    
+    def claim(self, worker_id, lease_seconds=SHARD_LEASE_SECONDS):
+        """Lease the oldest queued shard to worker_id; returns the shard dict or None.
+
+        The shard's emails that already have a successful result are left
+        out, so a reclaimed shard only repeats what the dead worker never
+        reported.
+        """
+        now = datetime.now().isoformat()
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")  # Take the write lock before looking, so two workers never lease one shard
+            self._expire_leases(conn)
+            row = conn.execute(
+                "SELECT shard_id, job_id, maven_url, emails, options, attempts FROM shards WHERE state = 'queued' "
+                "ORDER BY rowid LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            shard_id, job_id, maven_url, emails, options, attempts = row
+            conn.execute(
+                "UPDATE shards SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                "WHERE shard_id = ?", (worker_id, time.time() + lease_seconds, now, shard_id)
+            )
+            done = {email for (email,) in conn.execute(
+                "SELECT email FROM job_results WHERE job_id = ? AND status = 'success'", (job_id,)
+            )}
+        
+        return {
+            'shard_id': shard_id,
+            'job_id': job_id,
+            'maven_url': maven_url,
+            'emails': [email for email in json.loads(emails) if email not in done],
+            'options': json.loads(options),
+            'attempt': attempts + 1
+        }
+    
+    def renew(self, shard_id, worker_id, lease_seconds=SHARD_LEASE_SECONDS):
+        """Extend worker_id's lease; returns False if the worker no longer holds it"""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE shards SET lease_expires = ?, updated = ? WHERE shard_id = ? AND worker = ? AND state = 'leased'",
+                (time.time() + lease_seconds, datetime.now().isoformat(), shard_id, worker_id)
+            )
+        return cursor.rowcount == 1
+    
+    def report(self, shard_id, result):
+        """Store one email's result for the shard's job"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT job_id FROM shards WHERE shard_id = ?", (shard_id,)).fetchone()
+        if row:
+            self.record(row[0], result)
+    
+    def finish(self, shard_id, worker_id, results=(), error=None):
+        """Store a shard's final results and close it: done, or back in the queue (failed after max_attempts) on error"""
+        for result in results:
+            self.report(shard_id, result)
+        with closing(self._connect()) as conn, conn:
+            if error is None:
+                state = "'done'"
+            else:
+                state = "CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END"
+            cursor = conn.execute(
+                f"UPDATE shards SET state = {state}, worker = NULL, lease_expires = NULL, error = ?, updated = ? "
+                "WHERE shard_id = ? AND worker = ? AND state = 'leased'",
+                ((self.max_attempts,) if error is not None else ()) + (error, datetime.now().isoformat(), shard_id, worker_id)
+            )
+        return cursor.rowcount == 1
+    
+    def release(self, shard_id, worker_id, results=()):
+        """Hand a leased shard back unfinished (its worker is stopping) without counting the attempt"""
+        for result in results:
+            self.report(shard_id, result)
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "UPDATE shards SET state = 'queued', worker = NULL, lease_expires = NULL, attempts = MAX(attempts - 1, 0), "
+                "updated = ? WHERE shard_id = ? AND worker = ? AND state = 'leased'",
+                (datetime.now().isoformat(), shard_id, worker_id)
+            )
+        return cursor.rowcount == 1
+    
+    def cancel(self, job_id):
+        """Withdraw a job's queued shards; leased ones run to the end"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE shards SET state = 'cancelled', updated = ? WHERE job_id = ? AND state = 'queued'",
+                (datetime.now().isoformat(), job_id)
+            )
+    
+    def progress(self, job_id):
+        """Number of the job's shards in each state, after expiring dead workers' leases"""
+        counts = {'queued': 0, 'leased': 0, 'done': 0, 'failed': 0, 'cancelled': 0}
+        with closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._expire_leases(conn)
+            for state, count in conn.execute("SELECT state, COUNT(*) FROM shards WHERE job_id = ? GROUP BY state", (job_id,)):
+                counts[state] = count
+        return counts
+    
+    def results_since(self, job_id, cursor=0):
+        """Results recorded (or updated) after cursor; returns {'cursor', 'results'} for the next call"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT rowid, record FROM job_results WHERE job_id = ? AND rowid > ? ORDER BY rowid", (job_id, cursor)
+            ).fetchall()
+        return {'cursor': rows[-1][0] if rows else cursor, 'results': [json.loads(record) for _, record in rows]}
+
+class HttpShardQueue:
+    """Network shard queue backend: forwards every queue call to `python main.py queue-server`"""
+    
+    def __init__(self, url, token=SHARD_QUEUE_TOKEN, timeout=30):
+        self.url = url.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self._local = threading.local()
+    
+    def _session(self):
+        # One HTTP session per thread (lease heartbeats run beside the worker)
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            if self.token:
+                session.headers['Authorization'] = f"Bearer {self.token}"
+        return session
+    
+    def _call(self, method, *args, **kwargs):
+        response = self._session().post(f"{self.url}/{method}", json={'args': args, 'kwargs': kwargs}, timeout=self.timeout)
+        if response.status_code >= 400:
+            raise Exception(f"Shard queue {method} failed (HTTP {response.status_code}): {response.text[:200]}")
+        return response.json()['result']
+    
+    def __getattr__(self, name):
+        if name in SHARD_QUEUE_METHODS:
+            return lambda *args, **kwargs: self._call(name, *args, **kwargs)
+        raise AttributeError(name)
+
+# Shard queue backends by location scheme; anything else is a SQLite file path
+SHARD_QUEUE_BACKENDS = {
+    'http': HttpShardQueue,
+    'https': HttpShardQueue,
+}
+
+def open_shard_queue(location=SHARD_QUEUE):
+    """Shard queue backend for a location: a queue server URL or a SQLite file path"""
+    backend = SHARD_QUEUE_BACKENDS.get(urlsplit(location).scheme, SqliteShardQueue)
+    return backend(location)
+
+class ShardQueueHandler(BaseHTTPRequestHandler):
+    """Serve SHARD_QUEUE_METHODS of the server's queue as JSON POST endpoints"""
+    
+    def _respond(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == "/health":
+            self._respond(200, {'ok': True})
+        else:
+            self._respond(404, {'error': 'Not found'})
+    
+    def do_POST(self):
+        token = self.server.token
+        if token and self.headers.get('Authorization') != f"Bearer {token}":
+            self._respond(401, {'error': 'Bad or missing token'})
+            return
+        method = self.path.strip('/')
+        if method not in SHARD_QUEUE_METHODS:
+            self._respond(404, {'error': f"Unknown queue method: {method}"})
+            return
         
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            result = getattr(self.server.queue, method)(*payload.get('args', []), **payload.get('kwargs', {}))
+        except Exception as e:
+            debug_log(f"❌ Shard queue {method} failed: {str(e)}")
+            self._respond(500, {'error': str(e)})
+            return
+        self._respond(200, {'result': result})
+    
+    def log_message(self, format, *args):
+        pass  # Workers poll constantly; failures are logged above
+
+def serve_shard_queue(shard_queue, host='127.0.0.1', port=SHARD_QUEUE_PORT, token=SHARD_QUEUE_TOKEN):
+    """Create (not start) an HTTP server exposing shard_queue to workers on other nodes"""
+    server = ThreadingHTTPServer((host, port), ShardQueueHandler)
+    server.queue = shard_queue
+    server.token = token
+    return server
+
+def _run_shard(shard_queue, shard, worker_id, lease_seconds, control, job_store, log_container=None):
+    """Process one leased shard, renewing the lease until it is done; returns its results"""
+    shard_id, options = shard['shard_id'], shard['options']
+    if not shard['emails']:
+        # A reclaimed shard whose emails were all reported before its worker died
+        try:
+            shard_queue.finish(shard_id, worker_id, [], None)
+            debug_log(f"✅ Shard {shard_id} had nothing left to submit", log_container)
+        except Exception as e:
+            debug_log(f"⚠️ Could not finish empty shard {shard_id}; it returns when its lease expires: {str(e)}",
+                      log_container)
+        return []
+    shard_control = control.child()  # Stopping the worker stops the shard at once
+    lease_lost = threading.Event()
+    stop_heartbeat = threading.Event()
+    
+    def heartbeat():
+        while not stop_heartbeat.wait(lease_seconds / 3):
+            try:
+                if not shard_queue.renew(shard_id, worker_id, lease_seconds):
+                    # Someone else owns the shard now; stop before submitting its emails twice
+                    debug_log(f"⚠️ Lost the lease on shard {shard_id}; stopping it", log_container)
+                    lease_lost.set()
+                    shard_control.cancel()
+                    return
+            except Exception as e:
+                debug_log(f"⚠️ Could not renew the lease on shard {shard_id}: {str(e)}", log_container)
+    
+    def report(result):
+        try:
+            shard_queue.report(shard_id, result)
+        except Exception as e:
+            debug_log(f"⚠️ Could not report {result['email']}; it goes out with the shard: {str(e)}", log_container)
+    
+    debug_log(f"📦 Claimed shard {shard_id}: {len(shard['emails'])} emails for {shard['maven_url']} "
+              f"(attempt {shard['attempt']})", log_container)
+    heartbeat_thread = threading.Thread(target=heartbeat, name=f"lease-{shard_id}", daemon=True)
+    heartbeat_thread.start()
+    results, error, stopped = [], None, False
+    try:
+        results = automate_maven_signup(
+            shard['emails'], shard['maven_url'], options.get('delay_between_emails', 2), log_container,
+            options.get('num_workers', 1), resume=False, job_store=job_store, control=shard_control, on_result=report,
+            rate_limit=options.get('rate_limit'), http_mode=options.get('http_mode', False),
+            lean_browser=options.get('lean_browser', False), engine=options.get('engine', 'selenium')
+        )
+        stopped = shard_control.cancelled and not lease_lost.is_set()
+    except Exception as e:
+        error = str(e)
+        debug_log(f"💥 Shard {shard_id} failed: {error}", log_container)
     finally:
-        if driver:
-            debug_log("🔄 Closing browser...", log_container)
+        stop_heartbeat.set()
+        heartbeat_thread.join()
+    
+    if lease_lost.is_set():
+        return results
+    try:
+        if stopped and error is None:
+            # Give the lease back now rather than making the shard wait for it to expire
+            shard_queue.release(shard_id, worker_id, results)
+            debug_log(f"↩️ Worker stopping; released shard {shard_id} back to the queue", log_container)
+        else:
+            shard_queue.finish(shard_id, worker_id, results, error)
+            debug_log(f"✅ Finished shard {shard_id}" if error is None else f"🔁 Returned shard {shard_id} to the queue: {error}",
+                      log_container)
+    except Exception as e:
+        # The lease runs out and another claim picks the shard up without the results that did get reported
+        debug_log(f"⚠️ Could not hand shard {shard_id} back to the queue; it returns when its lease expires: {str(e)}",
+                  log_container)
+    return results
+
+def run_queue_worker(shard_queue, worker_id=None, lease_seconds=SHARD_LEASE_SECONDS, control=None, max_idle=None,
+                     log_container=None):
+    """Claim and process shards until control is cancelled, or the queue stays empty for max_idle seconds.
+
+    Each shard runs through automate_maven_signup with the settings it was
+    queued with, reporting every result as soon as it is known. A heartbeat
+    renews the lease at a third of its length, so a worker that dies or
+    hangs loses its shard to another worker once the lease expires.
+    Returns the number of shards processed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    control = control or JobControl()
+    debug_log(f"👷 Worker {worker_id} polling the shard queue", log_container)
+    shards = 0
+    idle_since = time.monotonic()
+    
+    # Local checkpoints for the shard's own retry rounds; the queue holds the shared results, so this run's
+    # scratch directory (with the database's WAL files) is removed when the worker exits
+    with tempfile.TemporaryDirectory(prefix="maven-worker-") as scratch_dir:
+        job_store = JobStore(os.path.join(scratch_dir, "checkpoints.sqlite3"))
+        while control.checkpoint():
             try:
-                driver.quit()
-                debug_log("✓ Browser closed successfully.", log_container)
+                shard = shard_queue.claim(worker_id, lease_seconds)
             except Exception as e:
-                debug_log(f"⚠️ Error closing browser: {str(e)}", log_container)
+                debug_log(f"⚠️ Could not reach the shard queue: {str(e)}", log_container)
+                shard = None
+            
+            if shard is None:
+                if max_idle is not None and time.monotonic() - idle_since >= max_idle:
+                    break
+                control.sleep(SHARD_POLL_SECONDS)
+                continue
+            
+            _run_shard(shard_queue, shard, worker_id, lease_seconds, control, job_store, log_container)
+            shards += 1
+            idle_since = time.monotonic()
+    
+    debug_log(f"👷 Worker {worker_id} stopping after {shards} shards", log_container)
+    return shards
+
+def automate_distributed(targets, delay_between_emails=2, log_container=None, num_workers=1, resume=True, control=None,
+                         on_result=None, rate_limit=None, http_mode=False, lean_browser=False, engine='selenium',
+                         shard_queue=None, shard_size=SHARD_SIZE):
+    """Queue (maven_url, emails) targets as shards for worker nodes and wait for their results.
+
+    Takes the settings of automate_targets; they apply per shard on
+    whichever worker claims it. on_result sees results as workers report
+    them. Cancelling withdraws the shards no worker has claimed yet.
+    Results come back grouped in target order.
+    """
+    shard_queue = shard_queue or open_shard_queue()
+    options = {
+        'delay_between_emails': delay_between_emails,
+        'num_workers': num_workers,
+        'rate_limit': rate_limit,
+        'http_mode': http_mode,
+        'lean_browser': lean_browser,
+        'engine': engine
+    }
+    jobs = []
+    for maven_url, emails in targets:
+        if emails:
+            job_id = shard_queue.enqueue(maven_url, list(emails), options, shard_size, resume)
+            jobs.append((job_id, maven_url, list(emails)))
+            debug_log(f"📦 Queued job {job_id} for {maven_url}: {len(emails)} emails in shards of {shard_size}", log_container)
+    
+    cursors = {job_id: 0 for job_id, _, _ in jobs}
+    unclaimed_since, warned = None, False
+    while True:
+        for job_id in cursors:
+            update = shard_queue.results_since(job_id, cursors[job_id])
+            cursors[job_id] = update['cursor']
+            for result in update['results']:
+                if on_result:
+                    on_result(result)
+        
+        progress = Counter()
+        for job_id in cursors:
+            progress.update(shard_queue.progress(job_id))
+        if not progress['queued'] and not progress['leased']:
+            break
+        if progress['leased']:
+            unclaimed_since = None
+        elif unclaimed_since is None:
+            unclaimed_since = time.monotonic()
+            warned = False
+        elif not warned and time.monotonic() - unclaimed_since >= SHARD_LEASE_SECONDS:
+            debug_log(f"⚠️ No worker has claimed a shard for {SHARD_LEASE_SECONDS}s; start one with `python main.py worker`",
+                      log_container)
+            warned = True
+        if control and control.cancelled:
+            for job_id in cursors:
+                shard_queue.cancel(job_id)
+            debug_log("🛑 Withdrew the unclaimed shards; claimed ones finish on their workers", log_container)
+            break
+        
+        pause(SHARD_POLL_SECONDS, control)
+    
+    if progress['failed']:
+        debug_log(f"⚠️ {progress['failed']} shards failed on every attempt; their unfinished emails stay pending", log_container)
+    
+    results = []
+    for job_id, _, emails in jobs:
+        recorded = shard_queue.results(job_id)
+        results.extend(recorded[email] for email in emails if email in recorded)
+    debug_log(f"📊 Distributed run: {len(results)} results, {len([r for r in results if r['status'] == 'success'])} successful",
+              log_container)
+    return results
+
+class JobControl:
+    """Thread-safe pause/resume/cancel switches checked between emails"""
+    
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._children = weakref.WeakSet()
+        self._lock = threading.Lock()
+    
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+    
+    @property
+    def paused(self):
+        return not self._running.is_set()
+    
+    def pause(self):
+        self._running.clear()
+    
+    def resume(self):
+        self._running.set()
+    
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Wake paused workers so they can stop
+        with self._lock:
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+    
+    def child(self):
+        """A control of its own that is also cancelled the moment this one is"""
+        child = JobControl()
+        with self._lock:
+            self._children.add(child)
+        if self.cancelled:
+            child.cancel()
+        return child
+    
+    def checkpoint(self):
+        """Block while paused; return False once the job has been cancelled"""
+        self._running.wait()
+        return not self.cancelled
+    
+    def sleep(self, seconds):
+        """Sleep that ends early when the job is cancelled"""
+        self._cancelled.wait(seconds)
+
+class AutomationJob:
+    """One queued signup run, owned by the JobRunner rather than a Streamlit session"""
+    
+    def __init__(self, targets, delay_between_emails=2, num_workers=1, resume=True, rate_limit=None, http_mode=False,
+                 lean_browser=False, engine='selenium', distributed=False, shard_size=SHARD_SIZE):
+        self.id = uuid.uuid4().hex[:8]
+        self.targets = [(maven_url, list(emails)) for maven_url, emails in targets]
+        self.total = sum(len(emails) for _, emails in self.targets)
+        self.delay_between_emails = delay_between_emails
+        self.num_workers = num_workers
+        self.resume = resume
+        self.rate_limit = rate_limit
+        self.http_mode = http_mode
+        self.lean_browser = lean_browser
+        self.engine = engine
+        self.distributed = distributed
+        self.shard_size = shard_size
+        self.control = JobControl()
+        self.created = datetime.now()
+        self.finished = None
+        self.results = []
+        self.timeline = []
+        self.processed = 0
+        self._finished = set()
+        self.error = None
+        self.logs = LogBuffer()
+        self._state = 'queued'
+    
+    @property
+    def state(self):
+        if self._state == 'running' and self.control.paused:
+            return 'paused'
+        return self._state
+    
+    @property
+    def active(self):
+        return self._state in ('queued', 'running')
+    
+    def add_log(self, record):
+        self.logs.add_log(record)
+    
+    def _on_result(self, result):
+        # Retried emails report more than once; count each target/email pair once
+        self._finished.add((result.get('target'), result['email']))
+        self.processed = len(self._finished)
+    
+    def run(self):
+        if self.control.cancelled:
+            self._state = 'cancelled'
+            return
+        
+        self._state = 'running'
+        try:
+            if self.distributed:
+                # Worker nodes do the browser work; their phase timelines stay with them
+                self.results = automate_distributed(
+                    self.targets, self.delay_between_emails, self, self.num_workers, self.resume,
+                    control=self.control, on_result=self._on_result, rate_limit=self.rate_limit,
+                    http_mode=self.http_mode, lean_browser=self.lean_browser, engine=self.engine,
+                    shard_size=self.shard_size
+                )
+            else:
+                self.results = automate_targets(
+                    self.targets, self.delay_between_emails, self, self.num_workers, self.resume,
+                    control=self.control, on_result=self._on_result, timeline=self.timeline, rate_limit=self.rate_limit,
+                    http_mode=self.http_mode, lean_browser=self.lean_browser, engine=self.engine
+                )
+            self._state = 'cancelled' if self.control.cancelled else 'completed'
+        except Exception as e:
+            self.error = str(e)
+            debug_log(f"💥 Job failed: {str(e)}", self)
+            debug_log(f"📋 Full error trace: {traceback.format_exc()}", self)
+            self._state = 'failed'
+        finally:
+            self.finished = datetime.now()
+
+class JobRunner:
+    """Background executor that owns the browser sessions.
+
+    Jobs are queued and run on dedicated threads, so the Streamlit script
+    only submits jobs and polls their state. Reruns and closed tabs don't
+    interrupt a running job.
+    """
+    
+    def __init__(self, max_concurrent_jobs=1):
+        self._queue = queue.Queue()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        for n in range(max_concurrent_jobs):
+            threading.Thread(target=self._work, name=f"job-runner-{n}", daemon=True).start()
+    
+    def submit(self, targets, delay_between_emails=2, num_workers=1, resume=True, rate_limit=None, http_mode=False,
+               lean_browser=False, engine='selenium', distributed=False, shard_size=SHARD_SIZE):
+        """Queue a job over a list of (maven_url, emails) targets"""
+        job = AutomationJob(targets, delay_between_emails, num_workers, resume, rate_limit, http_mode, lean_browser, engine,
+                            distributed, shard_size)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        return job
+    
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+    
+    def jobs(self):
+        """All jobs, newest first"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created, reverse=True)
+    
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                job.run()
+            finally:
+                self._queue.task_done()
+
+@st.cache_resource
+def get_job_runner():
+    """Process-wide job runner shared by every Streamlit session"""
+    return JobRunner(max_concurrent_jobs=int(os.environ.get('MAX_CONCURRENT_JOBS', 1)))
+
+def render_automation_results(results, timeline=None):
+    """Show summary metrics, downloads, error details and phase timings for a finished run"""
+    # Save results to file
+    results_json = json.dumps(results, indent=2)
+    
+    # Show results summary
+    success_count = len([r for r in results if r['status'] == 'success'])
+    error_count = len([r for r in results if r['status'] == 'error'])
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Processed", len(results))
+    with col2:
+        st.metric("Successful", success_count, delta=f"{success_count}/{len(results)}")
+    with col3:
+        st.metric("Errors", error_count, delta=f"{error_count}/{len(results)}")
+    
+    # Per-target breakdown for fan-out jobs
+    if len({r.get('target') for r in results}) > 1:
+        st.dataframe(pd.DataFrame([{
+            'Target': target,
+            'Successful': len([r for r in results if r.get('target') == target and r['status'] == 'success']),
+            'Errors': len([r for r in results if r.get('target') == target and r['status'] == 'error'])
+        } for target in dict.fromkeys(r.get('target') for r in results)]))
+    
+    # How the form was reset between emails
+    reset_strategies = Counter(r['reset_strategy'] for r in results if r.get('reset_strategy'))
+    if reset_strategies:
+        st.caption("🔁 Form resets: " + ", ".join(f"{strategy} {count}" for strategy, count in reset_strategies.most_common()))
+    
+    # Download results
+    st.download_button(
+        label="📥 Download Results JSON",
+        data=results_json,
+        file_name=f"maven_automation_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+        mime="application/json"
+    )
+    
+    # Show results details
+    if st.checkbox("Show detailed results"):
+        st.json(results)
+    
+    # Show error details if any
+    if error_count > 0:
+        st.warning(f"⚠️ {error_count} emails had errors during processing")
+        with st.expander("View Error Details"):
+            error_emails = [r for r in results if r['status'] == 'error']
+            for error in error_emails:
+                st.text(f"❌ {error['email']} ({error.get('error_kind', 'unclassified')}): {error['message']}")
+    
+    # Where the time went, per phase
+    if timeline:
+        st.subheader("⏱️ Phase Timings")
+        summary = summarize_timeline(timeline)
+        st.dataframe(pd.DataFrame(summary))
+        st.caption("Seconds per phase: submit = one in-page agent call, split into lookup, fill, submit_settle (click until the network is idle) and confirmation (waiting for the page's answer); navigation/reset = network bound, pacing = intentional delay")
+        
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download Timeline JSON",
+                data=json.dumps({'summary': summary, 'events': timeline}, indent=2),
+                file_name=f"maven_automation_timeline_{stamp}.json",
+                mime="application/json"
+            )
+        with col2:
+            st.download_button(
+                label="📥 Download Timeline CSV",
+                data=pd.DataFrame(timeline).to_csv(index=False),
+                file_name=f"maven_automation_timeline_{stamp}.csv",
+                mime="text/csv"
+            )
+
+def render_job_status(job):
+    """Show progress of a background job, and its results once it has finished"""
+    total = job.total
+    st.progress(min(job.processed / total, 1.0) if total else 0.0,
+                text=f"Job {job.id}: {job.processed}/{total} emails processed this run")
+    
+    if job.state == 'queued':
+        st.info("⏳ Job is queued and will start when a runner is free.")
+    elif job.state == 'running':
+        st.info("🔄 Automation is currently running... Please wait and watch the debug log below.")
+    elif job.state == 'paused':
+        st.warning("⏸️ Automation is paused. Resume it to continue with the next email.")
+    elif job.state == 'failed':
+        st.error(f"❌ Critical automation error: {job.error}")
+    elif job.results:
+        if job.state == 'cancelled':
+            st.warning("🛑 Automation was stopped. Unprocessed emails stay pending for the next run.")
+        else:
+            st.success("✅ Maven automation completed!")
+        
+        # Save results to session state
+        st.session_state.automation_results = job.results
+        render_automation_results(job.results, job.timeline)
+    else:
+        st.error("❌ Maven automation failed! Check the debug log for details.")
 
 def main():
+    # Page configuration; set here rather than at import so CLI and worker runs don't need a Streamlit session
+    st.set_page_config(
+        page_title="Maven Email Automation",
+        page_icon="📧",
+        layout="wide"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+    
     # Header
     st.markdown('<h1 class="main-header">📧 Maven Email Automation</h1>', unsafe_allow_html=True)
     st.markdown("Upload a CSV file with names and emails, then automate Maven signup process for all emails.")
@@ -750,6 +3730,20 @@ def main():
             # Show debug messages
             st.text_area("Debug Log", "\n".join(debug_messages), height=300)
         
+        st.markdown("---")
+        
+        # Extraction cache statistics
+        st.header("🗄️ Extraction Cache")
+        extraction_cache = get_extraction_cache()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Hits", extraction_cache.hits)
+        with col2:
+            st.metric("Misses", extraction_cache.misses)
+        if st.button("Clear Extraction Cache"):
+            extraction_cache.clear()
+            st.success("✅ Extraction cache cleared")
+        
         st.markdown("---")
         st.markdown("### How to use:")
         st.markdown("1. Test Chrome driver setup first")
@@ -762,7 +3756,9 @@ def main():
         st.markdown("---")
         st.markdown("### Features:")
         st.markdown("- AI-powered email extraction")
+        st.markdown("- Email validation, dedupe and domain lists")
         st.markdown("- Selenium automation for Maven")
+        st.markdown("- Parallel browser workers")
         st.markdown("- Enhanced debugging and logging")
         st.markdown("- Progress tracking")
         st.markdown("- Error handling and logging")
@@ -780,8 +3776,8 @@ def main():
         
         uploaded_file = st.file_uploader(
             "Choose a CSV file",
-            type=['csv'],
-            help="Upload a CSV file containing names and email addresses"
+            type=UPLOAD_TYPES,
+            help="Upload a CSV file containing names and email addresses. TSV, JSON lines, xlsx and gzip-compressed exports work too."
         )
         
         if uploaded_file is not None:
@@ -803,6 +3799,24 @@ def main():
     if uploaded_file is not None and st.button("🚀 Extract Emails", type="primary"):
         with st.spinner("Processing file and extracting emails..."):
             emails, df = process_csv_file(uploaded_file, api_key)
+            
+            # Normalize, validate and dedupe before anything reaches the browser
+            emails, validation = validate_emails(emails)
+        
+        if validation['avoided']:
+            blocked = validation['denied'] + validation['not_allowed']
+            st.info(
+                f"🧹 Validation removed {validation['avoided']} of {validation['input']} addresses "
+                f"({validation['invalid']} invalid, {validation['duplicates']} duplicates, {blocked} blocked by domain lists): "
+                f"{validation['avoided']} browser submissions avoided"
+            )
+            with st.expander("View removed addresses"):
+                st.dataframe(pd.DataFrame(validation['rejected']))
+        if validation['allowlist'] or validation['denylist']:
+            st.caption(
+                f"Domain lists: {validation['allowlist']} allowed ({DOMAIN_ALLOWLIST_PATH}), "
+                f"{validation['denylist']} denied ({DOMAIN_DENYLIST_PATH})"
+            )
         
         if emails:
             st.success(f"✅ Successfully extracted {len(emails)} unique emails!")
@@ -849,7 +3863,7 @@ def main():
                 # Show statistics
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Total Rows", len(df))
+                    st.metric("Total Rows", df.attrs.get('total_rows', len(df)))
                 with col2:
                     st.metric("Total Columns", len(df.columns))
                 with col3:
@@ -873,140 +3887,175 @@ def main():
             st.markdown("Configure settings for automatic Maven signup with extracted emails.")
             
             # Automation settings
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             with col1:
-                delay_between_emails = st.slider(
-                    "Delay between emails (seconds)",
-                    min_value=1,
-                    max_value=10,
-                    value=2,
-                    help="Time to wait between form submissions"
+                pacing_mode = st.radio(
+                    "Pacing",
+                    ["Fixed delay", "Adaptive"],
+                    horizontal=True,
+                    help="Adaptive pacing speeds up while submissions succeed quickly and backs off on errors, slow responses or HTTP 429/5xx answers"
                 )
+                if pacing_mode == "Adaptive":
+                    rate_limit = st.slider(
+                        "Max submissions per minute",
+                        min_value=5,
+                        max_value=120,
+                        value=30,
+                        help="Ceiling for the adaptive rate, shared by all workers of a page"
+                    )
+                    delay_between_emails = 0
+                else:
+                    delay_between_emails = st.slider(
+                        "Delay between emails (seconds)",
+                        min_value=1,
+                        max_value=10,
+                        value=2,
+                        help="Time to wait between form submissions"
+                    )
+                    rate_limit = None
             
             with col2:
+                engine_label = st.radio(
+                    "Browser engine",
+                    ["Chrome per worker", "Contexts in one Chrome"],
+                    horizontal=True,
+                    help="'Contexts in one Chrome' drives isolated browser contexts of a single headless Chrome over the DevTools Protocol, so many workers share one browser process"
+                )
+                engine = 'cdp' if engine_label == "Contexts in one Chrome" else 'selenium'
+                num_workers = st.slider(
+                    "Parallel browser workers",
+                    min_value=1,
+                    max_value=32 if engine == 'cdp' else 8,
+                    value=1,
+                    help="Number of browser sessions to run side by side. Chrome per worker splits emails evenly between them; contexts take the next email from a shared queue."
+                )
+            
+            with col3:
                 st.info(f"Total Emails: {len(emails)}")
             
             # Maven URL input
             st.markdown("### 🌐 Maven URL Configuration")
-            maven_url = st.text_input(
-                "Enter Maven URL to automate",
+            maven_urls_text = st.text_area(
+                "Enter Maven URLs to automate (one per line)",
                 value="https://maven.com/p/1f7efa/context-engineering-agentic-rag-for-product-managers?utm_medium=ll_share_link&utm_source=instructor",
-                help="Enter the full Maven URL where you want to automate the signup process",
+                help="Enter the full Maven URL of every page where you want to automate the signup process. Every email is submitted to every page, and pages are processed concurrently.",
                 placeholder="https://maven.com/p/..."
             )
+            maven_urls = list(dict.fromkeys(line.strip() for line in maven_urls_text.splitlines() if line.strip()))
             
-            if maven_url:
-                st.success(f"✅ Target URL: {maven_url}")
+            if maven_urls:
+                for maven_url in maven_urls:
+                    st.success(f"✅ Target URL: {maven_url}")
+                if len(maven_urls) > 1:
+                    st.info(f"🎯 {len(maven_urls)} targets × {len(emails)} emails = {len(maven_urls) * len(emails)} submissions, using up to {len(maven_urls) * num_workers} browsers")
             else:
                 st.warning("⚠️ Please enter a Maven URL to continue")
             
-            # Initialize session state for automation
-            if 'automation_running' not in st.session_state:
-                st.session_state.automation_running = False
+            resume_job = st.checkbox(
+                "Resume previous progress",
+                value=True,
+                help="Skip emails that were already submitted successfully in an earlier run of the same job"
+            )
+            
+            http_mode = st.checkbox(
+                "⚡ HTTP mode",
+                value=False,
+                help="Submit the first email in the browser, capture the request it sends, and replay that request for the other emails without a browser. Emails whose replay fails go through the browser."
+            )
+            
+            lean_browser = st.checkbox(
+                "🪶 Lean browser profile",
+                value=False,
+                help="Block images, fonts, media and analytics scripts, and start on the form as soon as the DOM is ready. Pages load faster and each browser needs less memory, so more workers fit in one container."
+            )
+            
+            distributed = st.checkbox(
+                "🌐 Distributed mode",
+                value=False,
+                help="Queue the emails in shards for worker containers (`python main.py worker`, scaled with `docker compose up --scale worker=N`) instead of running browsers in this container. The settings above apply per shard on each worker."
+            )
+            shard_size = SHARD_SIZE
+            if distributed:
+                shard_size = st.number_input(
+                    "Emails per shard",
+                    min_value=1,
+                    max_value=1000,
+                    value=SHARD_SIZE,
+                    help="How many emails a worker claims at a time. Smaller shards spread better over workers and lose less work when a worker dies."
+                )
+                st.caption(f"📦 Shard queue: {SHARD_QUEUE}")
+            
+            # Background job runner shared by every session
+            runner = get_job_runner()
+            active_job = runner.get(st.session_state.get('active_job_id'))
             
-            # Debug log container
-            debug_container = st.empty()
+            # Automation is running while this session's job is queued or in progress
+            st.session_state.automation_running = bool(active_job and active_job.active)
             
             # Start automation button
-            col1, col2 = st.columns([1, 1])
+            col1, col2, col3 = st.columns(3)
             with col1:
                 start_automation = st.button(
                     "🚀 Start Maven Automation", 
                     type="primary", 
-                    disabled=st.session_state.automation_running or not maven_url,
-                    help="Click to start the automated Maven signup process (requires valid URL)"
+                    disabled=not maven_urls,
+                    help="Queue an automated Maven signup job (requires valid URL). Jobs run in the background."
                 )
             
             with col2:
+                if st.session_state.automation_running:
+                    if active_job.control.paused:
+                        if st.button("▶️ Resume Automation"):
+                            active_job.control.resume()
+                    elif st.button("⏸️ Pause Automation"):
+                        active_job.control.pause()
+            
+            with col3:
                 if st.session_state.automation_running:
                     if st.button("🛑 Stop Automation", type="secondary"):
-                        st.session_state.automation_running = False
+                        active_job.control.cancel()
                         st.warning("Automation stopped by user")
             
-            # Show current status
-            if st.session_state.automation_running:
-                st.info("🔄 Automation is currently running... Please wait and watch the debug log below.")
-            
             if start_automation:
-                # Validate URL before starting
-                if not maven_url or not maven_url.strip():
+                # Validate URLs before starting
+                if not maven_urls:
                     st.error("❌ Please enter a valid Maven URL to start automation")
                     return
                 
-                if not maven_url.startswith("https://maven.com"):
-                    st.warning("⚠️ Warning: URL doesn't start with 'https://maven.com'. Are you sure this is a Maven URL?")
+                other_urls = [maven_url for maven_url in maven_urls if not maven_url.startswith("https://maven.com")]
+                if other_urls:
+                    st.warning(f"⚠️ Warning: {', '.join(other_urls)} doesn't start with 'https://maven.com'. Are you sure this is a Maven URL?")
                     if not st.button("Continue anyway", key="continue_anyway"):
                         return
                 
+                targets = [(maven_url, emails) for maven_url in maven_urls]
+                active_job = runner.submit(targets, delay_between_emails, num_workers, resume_job, rate_limit, http_mode,
+                                           lean_browser, engine, distributed, int(shard_size))
+                st.session_state.active_job_id = active_job.id
                 st.session_state.automation_running = True
                 
-                # Clear previous debug messages
-                if 'debug_messages' in st.session_state:
-                    st.session_state.debug_messages = []
-                
-                st.info("🚀 Starting Maven automation... Watch the debug log below for detailed progress.")
-                
-                try:
-                    # Run automation with debug logging
-                    results = automate_maven_signup(emails, maven_url, delay_between_emails, debug_container)
-                    
-                    if results:
-                        st.success("✅ Maven automation completed!")
-                        
-                        # Save results to session state
-                        st.session_state.automation_results = results
-                        
-                        # Save results to file
-                        results_json = json.dumps(results, indent=2)
-                        
-                        # Show results summary
-                        success_count = len([r for r in results if r['status'] == 'success'])
-                        error_count = len([r for r in results if r['status'] == 'error'])
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Total Processed", len(results))
-                        with col2:
-                            st.metric("Successful", success_count, delta=f"{success_count}/{len(results)}")
-                        with col3:
-                            st.metric("Errors", error_count, delta=f"{error_count}/{len(results)}")
-                        
-                        # Download results
-                        st.download_button(
-                            label="📥 Download Results JSON",
-                            data=results_json,
-                            file_name=f"maven_automation_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                            mime="application/json"
-                        )
-                        
-                        # Show results details
-                        if st.checkbox("Show detailed results"):
-                            st.json(results)
-                        
-                        # Show error details if any
-                        if error_count > 0:
-                            st.warning(f"⚠️ {error_count} emails had errors during processing")
-                            with st.expander("View Error Details"):
-                                error_emails = [r for r in results if r['status'] == 'error']
-                                for error in error_emails:
-                                    st.text(f"❌ {error['email']}: {error['message']}")
-                    else:
-                        st.error("❌ Maven automation failed! Check the debug log for details.")
-                        
-                except Exception as e:
-                    st.error(f"❌ Critical automation error: {str(e)}")
-                    st.text_area("Error Details", traceback.format_exc(), height=200)
-                    
-                finally:
-                    st.session_state.automation_running = False
+                st.info("🚀 Maven automation job queued... Watch the debug log below for detailed progress.")
+            
+            if active_job:
+                render_job_status(active_job)
+            
+            # All jobs known to this container
+            jobs = runner.jobs()
+            if jobs:
+                with st.expander(f"📋 Job Queue ({len([job for job in jobs if job.active])} active)"):
+                    st.dataframe(pd.DataFrame([{
+                        'Job': job.id,
+                        'State': job.state,
+                        'Processed': f"{job.processed}/{job.total}",
+                        'Targets': ", ".join(maven_url for maven_url, _ in job.targets),
+                        'Created': job.created.strftime('%H:%M:%S')
+                    } for job in jobs]))
             
             # Show debug log if we have messages
-            if 'debug_messages' in st.session_state and st.session_state.debug_messages:
+            if active_job and active_job.logs:
                 with st.expander("🔍 Debug Log", expanded=st.session_state.automation_running):
-                    st.markdown(
-                        f'<div class="debug-log">{"<br>".join(st.session_state.debug_messages)}</div>',
-                        unsafe_allow_html=True
-                    )
+                    st.markdown(active_job.logs.html(), unsafe_allow_html=True)
+                    st.caption(f"Full log: {LOG_FILE_PATH}")
             
             st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1017,6 +4066,217 @@ def main():
         "[GitHub](https://github.com) | "
         "[Documentation](https://docs.streamlit.io)"
     )
+    
+    # Poll the background job until it finishes
+    if st.session_state.get('automation_running'):
+        time.sleep(1)
+        st.rerun()
+
+# Exit codes of the command-line mode
+CLI_EXIT_OK = 0
+CLI_EXIT_SOME_FAILED = 1
+CLI_EXIT_BAD_INPUT = 2  # Same as argparse's usage errors
+CLI_EXIT_ALL_FAILED = 3
+CLI_EXIT_CANCELLED = 130
+
+class ConsoleOutput:
+    """Prints the messages the extraction helpers would otherwise show in Streamlit"""
+    
+    def empty(self):
+        return self
+    
+    def caption(self, message):
+        print(message, flush=True)
+    
+    info = caption
+    
+    def warning(self, message):
+        print(message, file=sys.stderr, flush=True)
+    
+    error = warning
+
+class LocalUpload(BytesIO):
+    """A file on disk with the name/size/getbuffer interface of a Streamlit upload"""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            super().__init__(f.read())
+        self.name = os.path.basename(path)
+        self.size = os.path.getsize(path)
+
+def parse_cli_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Run a Maven signup job from the command line, without the Streamlit UI.",
+        epilog=f"Exit codes: {CLI_EXIT_OK} all emails succeeded, {CLI_EXIT_SOME_FAILED} some failed, "
+               f"{CLI_EXIT_BAD_INPUT} bad arguments or no emails, {CLI_EXIT_ALL_FAILED} every email failed, "
+               f"{CLI_EXIT_CANCELLED} stopped by a signal."
+    )
+    parser.add_argument("csv", help="File with the email addresses: CSV, TSV, JSON lines or xlsx, optionally gzipped")
+    parser.add_argument("--url", dest="urls", action="append", required=True,
+                        help="Maven signup page to submit to; repeat for several targets")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel browsers (or CDP contexts) per target")
+    parser.add_argument("--delay", type=float, default=2, help="Seconds between emails per worker")
+    parser.add_argument("--rate-limit", type=int, default=None,
+                        help="Adaptive pacing up to this many submissions/min instead of --delay")
+    parser.add_argument("--engine", choices=('selenium', 'cdp'), default='selenium',
+                        help="selenium = one Chrome per worker, cdp = contexts in one Chrome")
+    parser.add_argument("--http-mode", action="store_true", help="Replay the captured form submission over HTTP")
+    parser.add_argument("--lean", action="store_true", help="Use the lean resource-blocking browser profile")
+    parser.add_argument("--no-resume", action="store_true", help="Submit every email again, even ones that already succeeded")
+    parser.add_argument("--openai-key", default=os.environ.get('OPENAI_API_KEY'),
+                        help="OpenAI key for files without an email column (default: $OPENAI_API_KEY, else regex only)")
+    parser.add_argument("--output", default=None,
+                        help="Path prefix for the results .json/.csv (default: maven_automation_results_<timestamp>)")
+    parser.add_argument("--distributed", action="store_true",
+                        help=f"Queue shards for worker nodes (`main.py worker`) in SHARD_QUEUE ({SHARD_QUEUE}) instead of running browsers here")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="Emails per shard in distributed mode")
+    parser.add_argument("--quiet", action="store_true", help="Only print per-email progress, not the automation log")
+    return parser.parse_args(argv)
+
+def _quiet_console():
+    """Keep only warnings and errors of the automation log on the console"""
+    for handler in get_logger().handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.WARNING)
+
+def _silence_bare_mode_warnings():
+    """Drop Streamlit's 'missing ScriptRunContext' warnings, which only say there is no app session"""
+    for name in ("streamlit.runtime.scriptrunner_utils.script_run_context", "streamlit.runtime.scriptrunner.script_run_context"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+def _cancel_on_signals(control, message):
+    """Cancel control on SIGINT/SIGTERM (docker stop), so runs end between emails instead of mid-submission"""
+    def stop(signum, frame):
+        print(message, file=sys.stderr, flush=True)
+        control.cancel()
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, stop)
+
+def cli_main(argv=None):
+    """Headless batch run: extract, validate, submit, write results; returns the exit code.
+
+    `main.py worker` and `main.py queue-server` start the distributed mode's
+    worker loop and queue server instead.
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    _silence_bare_mode_warnings()
+    if argv[:1] == ['worker']:
+        return worker_main(argv[1:])
+    if argv[:1] == ['queue-server']:
+        return queue_server_main(argv[1:])
+    
+    args = parse_cli_args(argv)
+    out = ConsoleOutput()
+    
+    if args.quiet:
+        _quiet_console()
+    
+    try:
+        upload = LocalUpload(args.csv)
+    except OSError as e:
+        out.error(f"❌ Could not read {args.csv}: {str(e)}")
+        return CLI_EXIT_BAD_INPUT
+    
+    emails, _ = process_csv_file(upload, args.openai_key, out)
+    emails, validation = validate_emails(emails)
+    out.caption(
+        f"🧹 {validation['valid']} valid emails from {validation['input']} found "
+        f"({validation['invalid']} invalid, {validation['duplicates']} duplicates, "
+        f"{validation['denied'] + validation['not_allowed']} blocked by domain lists)"
+    )
+    if not emails:
+        out.error("❌ No valid emails to submit")
+        return CLI_EXIT_BAD_INPUT
+    
+    # Unprocessed emails stay pending for the next run
+    control = JobControl()
+    _cancel_on_signals(control, "🛑 Stopping after the emails in progress; the rest stay pending for the next run")
+    
+    targets = [(maven_url, emails) for maven_url in args.urls]
+    total = len(targets) * len(emails)
+    finished = set()
+    progress_lock = threading.Lock()
+    
+    def on_result(result):
+        with progress_lock:
+            # Retried emails report more than once; count each target/email pair once
+            finished.add((result.get('target'), result['email']))
+            target = f" → {result['target']}" if len(targets) > 1 else ""
+            print(f"[{len(finished)}/{total}] {'✅' if result['status'] == 'success' else '❌'} "
+                  f"{result['email']}{target}: {result['message']}", flush=True)
+    
+    started = time.perf_counter()
+    if args.distributed:
+        results = automate_distributed(targets, args.delay, num_workers=args.workers, resume=not args.no_resume,
+                                       control=control, on_result=on_result, rate_limit=args.rate_limit,
+                                       http_mode=args.http_mode, lean_browser=args.lean, engine=args.engine,
+                                       shard_size=args.shard_size)
+    else:
+        results = automate_targets(targets, args.delay, num_workers=args.workers, resume=not args.no_resume, control=control,
+                                   on_result=on_result, rate_limit=args.rate_limit, http_mode=args.http_mode,
+                                   lean_browser=args.lean, engine=args.engine)
+    elapsed = time.perf_counter() - started
+    
+    prefix = args.output or f"maven_automation_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    with open(f"{prefix}.json", 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    pd.json_normalize(results).to_csv(f"{prefix}.csv", index=False)
+    
+    success_count = len([r for r in results if r['status'] == 'success'])
+    error_count = len([r for r in results if r['status'] == 'error'])
+    out.caption(f"📊 {success_count} successful, {error_count} errors, {total - len(results)} pending in {elapsed:.1f}s")
+    out.caption(f"💾 Results written to {prefix}.json and {prefix}.csv")
+    
+    if control.cancelled:
+        return CLI_EXIT_CANCELLED
+    if error_count and not success_count:
+        return CLI_EXIT_ALL_FAILED
+    return CLI_EXIT_SOME_FAILED if error_count else CLI_EXIT_OK
+
+def worker_main(argv=None):
+    """`main.py worker`: process shards from the shared queue until stopped"""
+    parser = argparse.ArgumentParser(prog="main.py worker", description="Claim and process email shards from the shared queue.")
+    parser.add_argument("--queue", default=SHARD_QUEUE, help="Queue server URL or SQLite file (default: $SHARD_QUEUE)")
+    parser.add_argument("--worker-id", default=None, help="Name in the queue's lease records (default: host-pid)")
+    parser.add_argument("--lease", type=int, default=SHARD_LEASE_SECONDS, help="Lease length in seconds")
+    parser.add_argument("--max-idle", type=float, default=None, help="Exit after this many seconds without a shard")
+    parser.add_argument("--quiet", action="store_true", help="Only print warnings and errors")
+    args = parser.parse_args(argv)
+    
+    if args.quiet:
+        _quiet_console()
+    control = JobControl()
+    _cancel_on_signals(control, "🛑 Stopping after the current emails; the rest of the shard goes back to the queue")
+    run_queue_worker(open_shard_queue(args.queue), args.worker_id, args.lease, control, args.max_idle)
+    get_session_manager().shutdown()
+    return CLI_EXIT_OK
+
+def queue_server_main(argv=None):
+    """`main.py queue-server`: serve a SQLite shard queue to workers on other nodes"""
+    parser = argparse.ArgumentParser(prog="main.py queue-server", description="Serve the shard queue over HTTP.")
+    parser.add_argument("--queue", default=os.path.join(DATA_DIR, "queue.sqlite3"), help="SQLite file holding the queue")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (0.0.0.0 inside a container)")
+    parser.add_argument("--port", type=int, default=SHARD_QUEUE_PORT)
+    args = parser.parse_args(argv)
+    
+    server = serve_shard_queue(SqliteShardQueue(args.queue), args.host, args.port)
+    debug_log(f"📬 Serving shard queue {args.queue} on http://{args.host}:{args.port}"
+              f"{' (token required)' if SHARD_QUEUE_TOKEN else ''}")
+    
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, stop)
+    server.serve_forever()
+    server.server_close()
+    return CLI_EXIT_OK
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `streamlit run main.py` serves the app; `python main.py data.csv --url ...` runs headless
+    if st.runtime.exists():
+        main()
+    else:
+        sys.exit(cli_main())
\ No newline at end of file